@@ -0,0 +1,68 @@
+"""Per-request agent setup: calling the ``TripAgents`` factory versus ``AgentRegistry.get``.
+
+Builds every agent the way a request used to (a fresh factory call, new
+tools and all) and then through the registry (one prebuilt template per
+agent, cloned per request), timing each and counting the memory tracemalloc
+sees allocated per request while the agents are held. Nothing is sent to a
+model: the agents are pinned to a crewAI LLM aimed at an unused address.
+
+    python benchmarks/bench_agent_registry.py --requests 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Before any trip_planner import: module-level caches read these at import time
+os.environ["TRIP_PLANNER_CACHE_DIR"] = tempfile.mkdtemp(prefix="trip_planner_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from crewai import LLM  # noqa: E402
+
+from trip_planner.agent_registry import AGENT_NAMES, AgentRegistry  # noqa: E402
+from trip_planner.agents2 import TripAgents  # noqa: E402
+
+
+def measure(label, build, requests):
+    timings, agents = [], []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(requests):
+        start = time.perf_counter()
+        agents.append(build(AGENT_NAMES[i % len(AGENT_NAMES)]))
+        timings.append(time.perf_counter() - start)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    timings.sort()
+    print(f"{label:<18} mean {statistics.mean(timings) * 1e3:7.2f} ms  "
+          f"p95 {timings[int(len(timings) * 0.95) - 1] * 1e3:7.2f} ms  "
+          f"retained {allocated / requests / 1024:7.1f} KiB/request  peak {peak / 1024 / 1024:6.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = LLM(model="gpt-4o-mini", api_key="stub", base_url="http://127.0.0.1:9/v1")
+    registry = AgentRegistry(TripAgents(llm=llm))
+
+    # What a request did before: a new TripAgents (and so new tools) and a factory call
+    def factory(name):
+        return getattr(TripAgents(llm=llm), name)()
+
+    print(f"agents {len(AGENT_NAMES)}  requests {args.requests}")
+    start = time.perf_counter()
+    registry.warm()
+    print(f"{'registry warm-up':<18} {(time.perf_counter() - start) * 1e3:7.2f} ms for {len(AGENT_NAMES)} templates")
+    measure("factory per call", factory, args.requests)
+    measure("registry.get", registry.get, args.requests)
+
+
+if __name__ == "__main__":
+    main()
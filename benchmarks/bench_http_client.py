@@ -0,0 +1,88 @@
+"""Compare bare ``requests.get`` against the pooled tool HTTP client.
+
+Starts a keep-alive stub server on localhost and issues the same number of
+GETs through both paths, reporting latency and sockets opened.
+
+    python benchmarks/bench_http_client.py --requests 2000 --threads 8
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from trip_planner.tools import http_client  # noqa: E402
+
+BODY = b'{"lat": 38.72, "lon": -9.14, "country": "PT", "name": "Lisbon"}'
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    accepted = 0
+
+    def get_request(self):
+        self.accepted += 1
+        return super().get_request()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # allow keep-alive
+    disable_nagle_algorithm = True  # otherwise delayed ACKs add ~40ms per keep-alive response
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, fetch, url, total, threads, server):
+    server.accepted = 0
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        fetch(url).content
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{label:<16} {total / wall:>9.0f} req/s  "
+          f"p50 {1000 * statistics.median(latencies):6.3f} ms  "
+          f"p99 {1000 * p99:6.3f} ms  "
+          f"connections {server.accepted}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = CountingServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/0.1/en/places/geoname"
+
+    http_client.configure(pool_maxsize=args.threads)
+    run("requests.get", lambda u: requests.get(u, timeout=10), url, args.requests, args.threads, server)
+    run("http_client.get", http_client.get, url, args.requests, args.threads, server)
+    print("per-host stats:", http_client.host_stats())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
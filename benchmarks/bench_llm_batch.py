@@ -0,0 +1,86 @@
+"""Classification throughput: one ``llm.invoke`` per item versus ``classify_batch``.
+
+Starts trip_planner.stub_server in-process, points a ChatOpenAI client at
+its OpenAI-compatible chat completions endpoint and classifies the same
+recommendations sequentially and then in batches at each concurrency.
+The LLM cache lives in a throwaway directory and every call bypasses it,
+so each run measures the upstream calls.
+
+    python benchmarks/bench_llm_batch.py --items 64 --concurrency 1 4 8 16 --latency lognormal:400:0.3
+    python benchmarks/bench_llm_batch.py --error-rate 0.1
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Before any trip_planner import: module-level caches read these at import time
+os.environ["TRIP_PLANNER_CACHE_DIR"] = tempfile.mkdtemp(prefix="trip_planner_bench_")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from trip_planner.stub_server import StubConfig, UpstreamProfile, start_stub_server  # noqa: E402
+from trip_planner.tools.airports import get_airport_index  # noqa: E402
+from trip_planner.tools.classify_justify import classify_batch, classify_city_prompt  # noqa: E402
+from trip_planner.tools.llm_cache import cached_invoke  # noqa: E402
+
+LLM_HOST = "api.openai.com"
+
+
+def make_recommendations(count):
+    cities = sorted(get_airport_index().airports, key=lambda a: a.city)[:count]
+    return [json.dumps({"recommended_city": [{
+        "name": a.city, "country": a.country, "description": f"A trip to {a.city}",
+        "match_score": round(0.5 + (i % 50) / 100, 2),
+        "estimated_cost": {"accommodation": 80 + i % 120, "food": 40, "activities": 60, "total_per_day": 180 + i % 120},
+    }]}) for i, a in enumerate(cities)]
+
+
+def report(label, items, wall, answers):
+    failures = sum(isinstance(answer, Exception) for answer in answers)
+    print(f"{label:<22} {len(items) / wall:>8.1f} items/s  wall {wall:7.2f} s  failed {failures:>3}/{len(items)}")
+
+
+def sequential(model, items):
+    answers = []
+    for item in items:
+        try:
+            answers.append(cached_invoke(model, classify_city_prompt(item), bypass=True))
+        except Exception as e:
+            answers.append(e)
+    return answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--latency", default="lognormal:400:0.3", help="chat completion latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    profile = UpstreamProfile(args.latency, args.error_rate, error_status=500)
+    server = start_stub_server(StubConfig(hosts={LLM_HOST: profile}, seed=args.seed))
+    model = ChatOpenAI(model="gpt-4o-mini", base_url=f"{server.url}/{LLM_HOST}/v1", api_key="stub",
+                       temperature=0, max_retries=0, timeout=30)
+    items = make_recommendations(args.items)
+    print(f"stub {server.url}  items {len(items)}  latency {args.latency}  error rate {args.error_rate}")
+
+    start = time.perf_counter()
+    answers = sequential(model, items)
+    report("sequential invoke", items, time.perf_counter() - start, answers)
+    for concurrency in args.concurrency:
+        start = time.perf_counter()
+        answers = classify_batch(items, max_concurrency=concurrency, bypass=True, model=model)
+        report(f"batch x{concurrency}", items, time.perf_counter() - start, answers)
+    assert len(answers) == len(items)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Throughput of the batch match-scoring engine vs. the original per-city loop.
+
+Generates synthetic cities, checks the batch scores equal the original
+scalar implementation bit for bit, and reports cities scored per second.
+
+    python benchmarks/bench_match_scoring.py --cities 20000 --profiles 8
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from trip_planner.tools.match_scoring import (  # noqa: E402
+    PREFERENCE_KEYWORDS, SEASON_KEYWORDS, MatchProfile, score_cities,
+)
+
+FILLER = ["a", "lovely", "place", "with", "friendly", "people", "and", "great", "views",
+          "heart", "cities", "smart", "coolest", "barstool", "hotel"]
+
+
+def reference_score(city, preferences, budget, season):
+    """The scalar calculate_match_score as it was before the batch engine."""
+    score = 0.0
+    description = city.get("description", "").lower()
+    for pref in preferences:
+        if pref in PREFERENCE_KEYWORDS:
+            for keyword in PREFERENCE_KEYWORDS[pref]:
+                if keyword in description:
+                    score += 0.1
+    daily_cost = city.get("estimated_cost", {}).get("total_per_day", 0)
+    if daily_cost <= budget:
+        score += 0.3
+    else:
+        budget_diff = (daily_cost - budget) / budget
+        score += max(0, 0.3 * (1 - budget_diff))
+    if season in SEASON_KEYWORDS:
+        for keyword in SEASON_KEYWORDS[season]:
+            if keyword in description:
+                score += 0.1
+    return min(max(score, 0), 1)
+
+
+def make_cities(n, rng):
+    vocabulary = [k for words in PREFERENCE_KEYWORDS.values() for k in words]
+    vocabulary += [k for words in SEASON_KEYWORDS.values() for k in words]
+    cities = []
+    for i in range(n):
+        words = rng.sample(vocabulary, rng.randint(0, 8)) + rng.sample(FILLER, 6)
+        rng.shuffle(words)
+        cities.append({
+            "name": f"City {i}",
+            "description": " ".join(words).capitalize(),
+            "estimated_cost": {"total_per_day": rng.randint(40, 600)},
+        })
+    return cities
+
+
+def make_profiles(m, rng):
+    return [
+        MatchProfile(rng.sample(list(PREFERENCE_KEYWORDS), rng.randint(1, 4)),
+                     rng.choice([50, 100, 150, 200, 300, 500]),
+                     rng.choice(list(SEASON_KEYWORDS)))
+        for _ in range(m)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cities", type=int, default=20000)
+    parser.add_argument("--profiles", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cities = make_cities(args.cities, rng)
+    profiles = make_profiles(args.profiles, rng)
+
+    start = time.perf_counter()
+    expected = [[reference_score(c, *p) for p in profiles] for c in cities]
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_cities(cities, profiles)
+    batch = time.perf_counter() - start
+
+    mismatches = sum(
+        1 for i, row in enumerate(expected) for j, value in enumerate(row) if scores[i, j] != value
+    )
+    pairs = args.cities * args.profiles
+    print(f"{args.cities} cities x {args.profiles} profiles")
+    print(f"scalar loop  {scalar:8.3f} s  {pairs / scalar:>12,.0f} pairs/s")
+    print(f"batch engine {batch:8.3f} s  {pairs / batch:>12,.0f} pairs/s  ({scalar / batch:.1f}x)")
+    print(f"mismatches vs scalar: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
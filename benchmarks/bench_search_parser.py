@@ -0,0 +1,74 @@
+"""Parse time and peak memory of the early-exit search parser vs. BeautifulSoup.
+
+Runs both extractors over saved DuckDuckGo HTML result pages, checks they
+agree on the result titles, and reports per-page time and tracemalloc peak.
+
+    python benchmarks/bench_search_parser.py --repeat 50
+    python benchmarks/bench_search_parser.py --pages ~/saved_ddg/*.html
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from trip_planner.tools.search_parser import parse_results  # noqa: E402
+
+PAGES_DIR = Path(__file__).resolve().parent / "data" / "search_pages"
+
+
+def soup_titles(html, limit=5):
+    """The extraction SearchInternetTool used before the streaming parser."""
+    soup = BeautifulSoup(html, "html.parser")
+    results = []
+    for a in soup.select(".result__title a")[:limit]:
+        title = a.get_text(strip=True)
+        if title:
+            results.append(title)
+    return results
+
+
+def measure(fn, html, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", nargs="*", type=Path, default=sorted(PAGES_DIR.glob("*.html")))
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    mismatches = 0
+    print(f"{'page':<36} {'bytes':>7}  {'soup ms':>8} {'soup KiB':>9}  {'fast ms':>8} {'fast KiB':>9}  speedup")
+    for path in args.pages:
+        html = path.read_text(encoding="utf-8")
+        soup_time, soup_peak = measure(lambda h: soup_titles(h, args.limit), html, args.repeat)
+        fast_time, fast_peak = measure(lambda h: parse_results(h, args.limit), html, args.repeat)
+        # Extra room for the sponsored results the old selector kept; get_text(strip=True)
+        # also glued words around <b> tags together, so compare without whitespace
+        soup = {"".join(t.split()) for t in soup_titles(html, args.limit + 3)}
+        if any("".join(r["title"].split()) not in soup for r in parse_results(html, args.limit)):
+            mismatches += 1
+        print(f"{path.name[:36]:<36} {len(html):>7}  {1000 * soup_time:8.2f} {soup_peak / 1024:9.0f}  "
+              f"{1000 * fast_time:8.2f} {fast_peak / 1024:9.0f}  {soup_time / fast_time:6.1f}x")
+    print(f"pages with titles missing from the BeautifulSoup output: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Concurrent load against a running fast_app: do crew runs overlap, and does the API stay responsive?
+
+Fires ``--requests`` POST /run-agent calls with ``--concurrency`` in flight
+and, meanwhile, probes GET /agents every ``--probe-interval`` seconds. Prints
+the status counts, how many crew requests were in flight at once (from each
+request's start and end), wall time against the summed request time, and
+/agents latency under load. With a blocking endpoint the overlap is 1 and
+/agents waits for whole crew runs.
+
+    uvicorn fast_app:app --port 8000
+    python benchmarks/load_fast_app.py --url http://127.0.0.1:8000 --requests 16 --concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+
+def max_overlap(intervals):
+    events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+    current = peak = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+async def run_agent(client, args, intervals, statuses):
+    start = time.perf_counter()
+    try:
+        response = await client.post("/run-agent", json={"agent_name": args.agent, "input_data": {"query": args.query}})
+        status = response.status_code if "error" not in response.json() else f"{response.status_code} error"
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    intervals.append((start, time.perf_counter()))
+    statuses[status] += 1
+
+
+async def probe(client, interval, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/agents")
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def main(args):
+    intervals, statuses, latencies = [], Counter(), []
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, args.probe_interval, stop, latencies))
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def bounded():
+            async with semaphore:
+                await run_agent(client, args, intervals, statuses)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded() for _ in range(args.requests)))
+        wall = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    busy = sum(end - start for start, end in intervals)
+    print(f"requests {args.requests}  concurrency {args.concurrency}  statuses {dict(statuses)}")
+    print(f"wall {wall:7.2f} s  summed request time {busy:7.2f} s  max in flight {max_overlap(intervals)}")
+    if latencies:
+        latencies.sort()
+        print(f"/agents under load: {len(latencies)} probes  median {statistics.median(latencies) * 1e3:7.1f} ms  "
+              f"max {latencies[-1] * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--agent", default="city_classifier")
+    parser.add_argument("--query", default="Is Lisbon in May ideal for a budget food trip?")
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--probe-interval", type=float, default=0.25)
+    parser.add_argument("--timeout", type=float, default=600)
+    asyncio.run(main(parser.parse_args()))
@@ -1,34 +1,55 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
+from typing import Optional
 import json
 from trip_planner import TripAgents  # adjust import path as needed
 from crewai import Task
-from langchain_openai import AzureChatOpenAI  # or ChatOpenAI, depending on your setup
+from trip_planner.tools.run_memo import crew_run
+from trip_planner.llm_routing import get_router
+from trip_planner.agent_registry import AgentRegistry
+from trip_planner.agents2 import TravelInput
+from trip_planner.full_trip import FullTripPlanner, SPECIALIST_TASKS
+from trip_planner.jobs import JobWorkerPool, open_job_queue
+from trip_planner.progress import ProgressStream, get_progress_hub, sse_message
+from fastapi.responses import StreamingResponse
+import asyncio
+import contextvars
 import os
+from concurrent.futures import ThreadPoolExecutor
 app = FastAPI()
 os.environ["AZURE_API_KEY"] = ""
 os.environ["AZURE_API_BASE"] = ""
 os.environ["AZURE_API_VERSION"] = "2025-01-01-preview"
  
-llm = AzureChatOpenAI(
-    azure_deployment="gpt-4.1-nano",
-    model_name="azure/gpt-4.1-nano",  # Your Azure deployment name
-    azure_endpoint=os.getenv("AZURE_API_BASE"),
-    api_key=os.getenv("AZURE_API_KEY"),
-    api_version="2025-01-01-preview",  # Your API version
-    temperature=0.7,
-    streaming=True,
-    model_kwargs={"stream_options": {"include_usage": True}}
-)  
-
-# Initialize your LLM here with your config
-# llm = AzureChatOpenAI(
-#     # Add your Azure or OpenAI config here,
-#     # e.g. deployment_name="gpt-4-deployment",
-#     # temperature=0
-# )
-
-trip_agents = TripAgents(llm)
+# Models per agent come from the LLM routing table; override with TRIP_PLANNER_LLM_ROUTES
+trip_agents = TripAgents(router=get_router())
+# Agents are built once per name and cloned per request
+agent_registry = AgentRegistry(trip_agents)
+
+# crew.kickoff() blocks for the whole LLM conversation, so crews run on this pool, never on the event loop
+CREW_WORKERS = int(os.getenv("TRIP_PLANNER_CREW_WORKERS", "4"))
+# Crew requests admitted at once (running plus queued for a worker); beyond that the endpoints answer 503
+CREW_MAX_PENDING = int(os.getenv("TRIP_PLANNER_CREW_MAX_PENDING", str(4 * CREW_WORKERS)))
+crew_executor = ThreadPoolExecutor(max_workers=CREW_WORKERS, thread_name_prefix="crew")
+crew_slots = asyncio.Semaphore(CREW_MAX_PENDING)
+# Each full-trip run fans its specialists out on the planner's own pool
+full_trip_planner = FullTripPlanner(agent_registry, max_workers=CREW_WORKERS * len(SPECIALIST_TASKS))
+
+
+async def run_crew_job(func, *args):
+    """Await a blocking crew call on crew_executor, keeping the event loop free for other requests"""
+    if crew_slots.locked():
+        raise HTTPException(status_code=503, detail="Too many crew runs in progress, retry later")
+    async with crew_slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(crew_executor, contextvars.copy_context().run, func, *args)
+
+
+@app.on_event("shutdown")
+def shutdown_crew_executors():
+    crew_executor.shutdown(wait=False, cancel_futures=True)
+    full_trip_planner.shutdown()
+    job_workers.stop(timeout=5)
 
 # Pydantic model for input to /run-agent
 class AgentInput(BaseModel):
@@ -49,6 +70,8 @@ agent_methods = {
     "city_justifier": trip_agents.city_justifier,
     "trip_classifier": trip_agents.trip_classifier,
     "trip_justifier": trip_agents.trip_justifier,
+    "city_evaluator": trip_agents.city_evaluator,
+    "trip_evaluator": trip_agents.trip_evaluator,
 }
 
 import json
@@ -71,6 +94,8 @@ agent_methods = {
     "city_justifier": trip_agents.city_justifier,
     "trip_classifier": trip_agents.trip_classifier,
     "trip_justifier": trip_agents.trip_justifier,
+    "city_evaluator": trip_agents.city_evaluator,
+    "trip_evaluator": trip_agents.trip_evaluator,
 }
 
 expected_output_map = {
@@ -85,14 +110,16 @@ expected_output_map = {
     "city_classifier": "Classification output: Ideal or Not Ideal.",
     "city_justifier": "Justification for city classification.",
     "trip_classifier": "Classification output: Ideal or Not Ideal trip.",
-    "trip_justifier": "Justification for trip classification."
+    "trip_justifier": "Justification for trip classification.",
+    "city_evaluator": "JSON with the city classification label (Ideal or Not Ideal) and its justification.",
+    "trip_evaluator": "JSON with the trip classification label (Ideal or Not Ideal) and its justification."
 }
 
-def run_agent_task(agent_name: str, input_data: dict):
+def run_agent_task(agent_name: str, input_data: dict, agent=None):
     if agent_name not in agent_methods:
         raise ValueError(f"Agent '{agent_name}' not found")
 
-    agent = agent_methods[agent_name]()
+    agent = agent or agent_registry.get(agent_name)
     input_str = json.dumps(input_data)
 
     task = {
@@ -102,7 +129,8 @@ def run_agent_task(agent_name: str, input_data: dict):
     }
 
     crew = Crew(tasks=[task])
-    result = crew.kickoff()
+    with crew_run():
+        result = crew.kickoff()
 
     # Assuming the output key is 'task_1_output' (Crew assigns keys by task index)
     return result
@@ -114,11 +142,103 @@ class AgentRequest(BaseModel):
 @app.post("/run-agent")
 async def run_task(request: AgentRequest):
     try:
-        output = run_agent_task(request.agent_name, request.input_data)
+        output = await run_crew_job(run_agent_task, request.agent_name, request.input_data)
         return {"result": output}
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e)}
 
+# Task, tool and LLM token events of running crews, routed to the request whose agent emitted them
+progress_hub = get_progress_hub()
+streaming_runs = set()
+
+@app.post("/run-agent/stream")
+async def run_task_stream(request: AgentRequest):
+    """Server-sent events: run_started, task_started/task_completed, tool_started/tool_finished/tool_error, token, then result or error"""
+    if request.agent_name not in agent_methods:
+        raise HTTPException(status_code=404, detail=f"Agent '{request.agent_name}' not found")
+    if crew_slots.locked():
+        raise HTTPException(status_code=503, detail="Too many crew runs in progress, retry later")
+
+    # Token events need an LLM that streams, whatever the agent's route says
+    agent = agent_registry.get(request.agent_name, stream=True)
+    stream = ProgressStream(asyncio.get_running_loop())
+    progress_hub.subscribe([agent.id], stream)
+
+    async def run():
+        try:
+            output = await run_crew_job(run_agent_task, request.agent_name, request.input_data, agent)
+            stream.push("result", {"result": getattr(output, "raw", output)})
+        except Exception as e:
+            stream.push("error", {"error": getattr(e, "detail", None) or str(e)})
+        finally:
+            progress_hub.unsubscribe([agent.id])
+            stream.close()
+
+    # The loop only holds tasks weakly; the run must finish (and free its slot) even if the client goes away
+    crew_task = asyncio.create_task(run())
+    streaming_runs.add(crew_task)
+    crew_task.add_done_callback(streaming_runs.discard)
+
+    async def events():
+        yield sse_message("run_started", {"agent": request.agent_name})
+        try:
+            async for message in stream.messages():
+                yield message
+        finally:
+            if not crew_task.done():
+                progress_hub.unsubscribe([agent.id])
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+class FullTripRequest(BaseModel):
+    travel: TravelInput
+    origin: Optional[str] = None
+
+@app.post("/plan-trip")
+async def plan_trip(request: FullTripRequest):
+    """Specialists in parallel, merged by travel_planning_expert"""
+    try:
+        result = await run_crew_job(full_trip_planner.plan, request.travel, request.origin)
+        return {
+            "result": result.plan,
+            "specialists": result.specialist_outputs,
+            "timings": {name: round(seconds, 3) for name, seconds in result.timings.items()},
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        return {"error": str(e)}
+
+def run_job(agent_name: str, input_data: dict):
+    result = run_agent_task(agent_name, input_data)
+    return getattr(result, "raw", result)
+
+# Queued agent runs outlive the request (and the process); TRIP_PLANNER_JOB_WORKERS threads drain them
+job_queue = open_job_queue()
+job_workers = JobWorkerPool(job_queue, run_job)
+
+@app.on_event("startup")
+def start_job_workers():
+    job_workers.start()
+
+@app.post("/jobs", status_code=202)
+def create_job(request: AgentRequest):
+    if request.agent_name not in agent_methods:
+        raise HTTPException(status_code=404, detail=f"Agent '{request.agent_name}' not found")
+    job_id = job_queue.enqueue(request.agent_name, request.input_data)
+    job_workers.notify()
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
 @app.get("/agents")
 def list_agents():
     return {"available_agents": list(agent_methods.keys())}
@@ -0,0 +1,97 @@
+import copy
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from crewai import Agent
+
+from .agents2 import TripAgents
+
+AGENT_NAMES = (
+    "expert_travel_agent",
+    "city_selection_expert",
+    "local_tour_guide",
+    "transportation_specialist",
+    "accommodation_expert",
+    "food_dining_guide",
+    "travel_planning_expert",
+    "budget_planner",
+    "city_classifier",
+    "city_justifier",
+    "trip_classifier",
+    "trip_justifier",
+    "city_evaluator",
+    "trip_evaluator",
+)
+
+
+def clone_agent(template: Agent, llm: Optional[Any] = None) -> Agent:
+    """Shallow per-request copy of a prebuilt agent.
+
+    Configuration, the LLM client and the (stateless) tool instances are
+    shared with the template; everything crewAI mutates while executing a
+    task (executor, crew link, tool results, token and failure counters)
+    starts fresh, so concurrent requests never see each other's state.
+    ``llm`` replaces the template's LLM in the copy.
+    """
+    update = {
+        "id": uuid.uuid4(),
+        "tools": list(template.tools or []),
+        "tools_results": [],
+        "agent_executor": None,
+        "crew": None,
+        "tools_handler": copy.copy(template.tools_handler),
+        "cache_handler": None,
+    }
+    if llm is not None:
+        update["llm"] = llm
+    agent = template.model_copy(update=update)
+    # model_copy gives the copy its own private-attribute dict, but the values are still the template's
+    private = agent.__pydantic_private__
+    if private:
+        for name, value in private.items():
+            if isinstance(value, list):
+                private[name] = []
+        if private.get("_token_process") is not None:
+            private["_token_process"] = type(private["_token_process"])()
+        if "_times_executed" in private:
+            private["_times_executed"] = 0
+    return agent
+
+
+class AgentRegistry:
+    """Builds each ``TripAgents`` agent once, as a template, and hands out cheap clones per request."""
+
+    def __init__(self, trip_agents: Optional[TripAgents] = None):
+        self.trip_agents = trip_agents or TripAgents()
+        self._templates: Dict[str, Agent] = {}
+        self._lock = threading.Lock()
+
+    def names(self) -> List[str]:
+        return list(AGENT_NAMES)
+
+    def template(self, name: str) -> Agent:
+        """The shared, never-executed agent for ``name``; do not hand it to a crew."""
+        template = self._templates.get(name)
+        if template is None:
+            if name not in AGENT_NAMES:
+                raise KeyError(f"Agent '{name}' not found")
+            with self._lock:
+                template = self._templates.get(name)
+                if template is None:
+                    template = self._templates[name] = getattr(self.trip_agents, name)()
+        return template
+
+    def get(self, name: str, stream: bool = False) -> Agent:
+        """A fresh agent for one request, cloned from the prebuilt template.
+
+        With ``stream`` the agent gets its route's streaming LLM, so crewAI
+        emits ``LLMStreamChunkEvent`` for each chunk it receives.
+        """
+        template = self.template(name)
+        return clone_agent(template, self.trip_agents.agent_llm(name, stream=True) if stream else None)
+
+    def warm(self):
+        """Build every template up front, e.g. at server start."""
+        for name in AGENT_NAMES:
+            self.template(name)
@@ -1,11 +1,12 @@
 from crewai import Agent, Task
+from crewai.tools import BaseTool
 from textwrap import dedent
 from langchain_openai import ChatOpenAI, AzureChatOpenAI
 import os
 from datetime import datetime
 import uuid
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Type
 from pydantic import BaseModel, Field, validator
 from langchain.tools import Tool
 from trip_planner.tools.calculator_tools import CalculatorTool
@@ -21,9 +22,12 @@ from trip_planner.tools.travel_tools import (
     MatchScoreTool,
     GeocodeTool
 )
-from trip_planner.tools.classify_justify import ClassifyTripTool, JustifyTripTool, ClassifyCityTool, JustifyCityTool
+from trip_planner.tools.classify_justify import (
+    ClassifyTripTool, JustifyTripTool, ClassifyCityTool, JustifyCityTool, EvaluateCityTool, EvaluateTripTool
+)
 from trip_planner.guardrails import GuardrailManager
 from trip_planner.telemetry import setup_telemetry
+from trip_planner.llm_routing import LLMRouter, get_router
 
 from trip_planner.debug_agent import DebugAgent
 
@@ -134,13 +138,33 @@ class CityOutput(BaseModel):
 
     
 class TripAgents:
-    def __init__(self, llm: AzureChatOpenAI, agent_name="Trip Agent"): #ChatOpenAI
+    def __init__(self, llm: Optional[AzureChatOpenAI] = None, agent_name="Trip Agent", router: Optional[LLMRouter] = None): #ChatOpenAI
+        # An explicit llm pins every agent to it; otherwise each agent gets its route's model from the router
         self.llm = llm
+        self.router = router or get_router()
         self.guardrails = GuardrailManager()
+        # Tools keep no per-call state, so every agent shares one instance of each
+        self._tools: Dict[type, BaseTool] = {}
         # configure_tracing(agent_name)
 
+    def _tool(self, tool_class: Type[BaseTool]) -> BaseTool:
+        tool = self._tools.get(tool_class)
+        if tool is None:
+            tool = self._tools.setdefault(tool_class, tool_class())
+        return tool
+
+    def agent_llm(self, name: str, stream: Optional[bool] = None):
+        """LLM for the agent built by factory ``name``: the pinned one, or its route's crewAI LLM"""
+        return self.llm or self.router.agent_llm(name, stream)
+
+    def _agent(self, name: str, **kwargs) -> Agent:
+        """Agent built by factory ``name`` on the model its route assigns"""
+        agent = Agent(llm=self.agent_llm(name), **kwargs)
+        self.router.register_role(agent.role, name)
+        return agent
+
     def expert_travel_agent(self):
-        return Agent(
+        return self._agent("expert_travel_agent",
             role="Expert Travel Agent",
             backstory=dedent(f"""Expert in travel planning and logistics. 
                              I have decades of experience making travel iteneraries"""),
@@ -153,14 +177,13 @@ class TripAgents:
                         Do not rely only on your own knowledge.
                         """),
             tools=[
-                SearchInternetTool(),
-                WeatherForecastTool(),
-                LocalEventsTool(),
-                TravelBudgetTool() 
+                self._tool(SearchInternetTool),
+                self._tool(WeatherForecastTool),
+                self._tool(LocalEventsTool),
+                self._tool(TravelBudgetTool) 
             ],
             
             verbose=True,
-            llm=self.llm,
             input_schema=TravelInput,
             output_schema=TravelOutput,
             input_validation=True,
@@ -170,7 +193,7 @@ class TripAgents:
 
     def city_selection_expert(self) -> Agent:
         """Create an agent for city selection"""
-        return Agent(
+        return self._agent("city_selection_expert",
             role="City Selection Expert",
             goal="Recommend the one good city based on user preferences and constraints",
             backstory="""You are an expert travel advisor with extensive knowledge of cities worldwide.
@@ -179,12 +202,11 @@ class TripAgents:
             matches the user's preferences. NEVER attempt to delegate work to a co-worker. If you cannot find real cities, return a static JSON with at least one city recommendation in the required format.
             """,
             verbose=True,
-            llm=self.llm,
             tools=[
-                SearchInternetTool(),
-                TravelBudgetTool(),
-                SafetyInfoTool(),
-                MatchScoreTool()
+                self._tool(SearchInternetTool),
+                self._tool(TravelBudgetTool),
+                self._tool(SafetyInfoTool),
+                self._tool(MatchScoreTool)
             ],
             input_schema=CityInput,
             output_schema=CityOutput,
@@ -213,86 +235,81 @@ class TripAgents:
         )
 
     def local_tour_guide(self):
-        return Agent(
+        return self._agent("local_tour_guide",
             role="Local Tour Guide",
             backstory=dedent(f"""I am an experienced local tour guide who knows all the hidden gems and must-see spots in the city."""),
             goal=dedent(f"""Create a detailed itinerary for a day tour in the city, including food recommendations, cultural experiences, and shopping spots."""),
             tools=[
-                SearchInternetTool(),
-                LocalEventsTool(),
-                RestaurantRecommendationsTool()
+                self._tool(SearchInternetTool),
+                self._tool(LocalEventsTool),
+                self._tool(RestaurantRecommendationsTool)
             ],
             verbose=True,
-            llm=self.llm,
         )
     
     def transportation_specialist(self):
-        return Agent(
+        return self._agent("transportation_specialist",
             role="Transportation Specialist",
             backstory=dedent(f"""I am a transportation expert with extensive knowledge of various travel methods, routes, and transit systems worldwide. 
                              I specialize in optimizing travel routes and finding the most efficient transportation options."""),
             goal=dedent(f"""Plan optimal transportation routes, suggest the best travel methods, provide public transit information, 
                         and estimate accurate travel times between locations for the traveler's itinerary."""),
             tools=[
-                SearchInternetTool(),
-                CalculatorTool(),
-                TransportationRoutesTool(),
-                TravelBudgetTool(),
+                self._tool(SearchInternetTool),
+                self._tool(CalculatorTool),
+                self._tool(TransportationRoutesTool),
+                self._tool(TravelBudgetTool),
             ],
             verbose=True,
-            llm=self.llm,
         )
 
     def accommodation_expert(self):
-        return Agent(
+        return self._agent("accommodation_expert",
             role="Accommodation Expert",
             backstory=dedent(f"""I am a seasoned accommodation specialist with years of experience in the hospitality industry. 
                              I have deep knowledge of various lodging options, neighborhoods, and booking strategies worldwide."""),
             goal=dedent(f"""Recommend the best hotels and rentals, suggest ideal neighborhoods to stay in, provide booking tips, 
                         and analyze accommodation reviews to ensure the best stay for travelers."""),
             tools=[
-                SearchInternetTool(),
-                AccommodationOptionsTool(),
-                TravelBudgetTool(),
-                SafetyInfoTool()
+                self._tool(SearchInternetTool),
+                self._tool(AccommodationOptionsTool),
+                self._tool(TravelBudgetTool),
+                self._tool(SafetyInfoTool)
             ],
             
             verbose=True,
-            llm=self.llm,
         )
 
     def food_dining_guide(self):
-        return Agent(
+        return self._agent("food_dining_guide",
             role="Food & Dining Guide",
             backstory=dedent(f"""I am a culinary expert and food tour specialist with extensive knowledge of global cuisines, 
                              local specialties, and dietary requirements. I have experience in creating memorable food experiences."""),
             goal=dedent(f"""Recommend the best restaurants, suggest local specialties, provide dietary restriction information, 
                         and create comprehensive food tour itineraries that showcase the destination's culinary scene."""),
             tools=[
-                SearchInternetTool(),
-                RestaurantRecommendationsTool(),
-                LocalEventsTool(),
-                TravelBudgetTool()
+                self._tool(SearchInternetTool),
+                self._tool(RestaurantRecommendationsTool),
+                self._tool(LocalEventsTool),
+                self._tool(TravelBudgetTool)
             ],
             verbose=True,
-            llm=self.llm,
         )
 
     def travel_planning_expert(self) -> Agent:
         """Create an agent for travel planning"""
-        return Agent(
+        return self._agent("travel_planning_expert",
             role="Travel Planning Expert",
             goal="Create travel plan which includes one activity, one meal plan and overall budget_breakdown",
             backstory="""You are a seasoned travel planner with years of experience creating
             personalized travel itineraries. You excel at balancing activities, managing budgets,
             and ensuring travelers have memorable experiences.""",
             verbose=True,
-            llm=self.llm,
             tools=[
-                SearchInternetTool(),
-                WeatherForecastTool(),
-                LocalEventsTool(),
-                TravelBudgetTool()
+                self._tool(SearchInternetTool),
+                self._tool(WeatherForecastTool),
+                self._tool(LocalEventsTool),
+                self._tool(TravelBudgetTool)
             ],
             output_format={
                 "type": "json",
@@ -330,17 +347,16 @@ class TripAgents:
 
     def budget_planner(self) -> Agent:
         """Create an agent for budget planning"""
-        return Agent(
+        return self._agent("budget_planner",
             role="Budget Planning Expert",
             goal="Create detailed and accurate travel budgets",
             backstory="""You are a financial expert specializing in travel budgeting.
             You have extensive experience in creating detailed travel budgets that account for
             all possible expenses while ensuring the best value for money.""",
             verbose=True,
-            llm=self.llm,
             tools=[
-                SearchInternetTool(),
-                CalculatorTool(),
+                self._tool(SearchInternetTool),
+                self._tool(CalculatorTool),
             ],
             output_format={
                 "type": "json",
@@ -357,40 +373,54 @@ class TripAgents:
         )
 
     def city_classifier(self) -> Agent:
-        return Agent(
+        return self._agent("city_classifier",
                 role="City Classifier",
                 goal="Classify if the recommended city is Ideal or Not Ideal based on the cost and description",
                 backstory="Expert in evaluating the quality of trips based on traveler preferences.",
-                tools=[ClassifyCityTool()],
-                llm=self.llm
+                tools=[self._tool(ClassifyCityTool)],
             )
 
     def city_justifier(self) -> Agent:
-        return Agent(
+        return self._agent("city_justifier",
             role="City Justifier",
             goal="Justify why the recommended city is Ideal or Not Ideal",
             backstory="An experienced travel advisor who gives reasons for classification.",
-            tools=[JustifyCityTool()],
-            llm=self.llm
+            tools=[self._tool(JustifyCityTool)],
         )
 
     
     def trip_classifier(self) -> Agent:
-        return Agent(
+        return self._agent("trip_classifier",
                 role="Trip Classifier",
                 goal="Classify if the travel is Ideal or Not Ideal based on the summary",
                 backstory="Expert in evaluating the quality of trips based on traveler preferences.",
-                tools=[ClassifyTripTool()],
-                llm=self.llm
+                tools=[self._tool(ClassifyTripTool)],
             )
 
     def trip_justifier(self) -> Agent:
-        return Agent(
+        return self._agent("trip_justifier",
             role="Trip Justifier",
             goal="Justify why the travel plan is classified as Ideal or Not Ideal",
             backstory="An experienced travel advisor who gives reasons for classification.",
-            tools=[JustifyTripTool()],
-            llm=self.llm
+            tools=[self._tool(JustifyTripTool)],
+        )
+
+    def city_evaluator(self) -> Agent:
+        """Classifier and justifier in one: a single tool call returns both the label and the reason"""
+        return self._agent("city_evaluator",
+            role="City Evaluator",
+            goal="Classify if the recommended city is Ideal or Not Ideal and justify the classification",
+            backstory="Expert travel advisor who evaluates recommended cities against traveler preferences and explains the verdict.",
+            tools=[self._tool(EvaluateCityTool)],
+        )
+
+    def trip_evaluator(self) -> Agent:
+        """Classifier and justifier in one: a single tool call returns both the label and the reason"""
+        return self._agent("trip_evaluator",
+            role="Trip Evaluator",
+            goal="Classify if the travel plan is Ideal or Not Ideal and justify the classification",
+            backstory="Expert travel advisor who evaluates travel plans on budget, itinerary and recommendations and explains the verdict.",
+            tools=[self._tool(EvaluateTripTool)],
         )
 
 # def configure_tracing(agent_name: str):
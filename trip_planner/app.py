@@ -10,8 +10,13 @@ load_dotenv()
 from trip_planner.telemetry import setup_telemetry
 from langchain_openai import ChatOpenAI,AzureChatOpenAI
 from .agents2 import TripAgents, TravelInput, CityInput
+from .llm_routing import get_router
+from .agent_registry import AgentRegistry
+from .full_trip import FullTripPlanner, merge_description
 from .guardrails import GuardrailManager
 from .tools.travel_tools import WeatherForecastTool, LocalEventsTool,SafetyInfoTool
+from .tools.run_memo import crew_run
+from .tools.classify_justify import parse_evaluation
 from crewai import Task, Crew
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
@@ -51,6 +56,19 @@ def safe_json_loads(raw_text: str):
 st.success("Telemetry initialized successfully!")
 tracer = trace.get_tracer(__name__)
 
+# One evaluator agent returning label and justification instead of a classifier followed by a justifier
+FUSED_EVALUATION = os.getenv("TRIP_PLANNER_FUSED_EVALUATION", "0") in ("1", "true", "True")
+# Specialists research the trip in parallel and travel_planning_expert merges their notes into the plan
+FULL_TRIP_PIPELINE = os.getenv("TRIP_PLANNER_FULL_TRIP_PIPELINE", "0") in ("1", "true", "True")
+
+
+def evaluation_outputs(result):
+    """(classification, justification) from the tasks that follow the recommendation or plan"""
+    if FUSED_EVALUATION:
+        evaluation = parse_evaluation(result.tasks_output[1].raw)
+        return evaluation["label"], evaluation["justification"]
+    return result.tasks_output[1].raw, result.tasks_output[2].raw
+
 
 st.info("Test trace created successfully!")
 # from opentelemetry.instrumentation.crewai import CrewAIInstrumentor
@@ -78,21 +96,10 @@ os.environ["AZURE_API_KEY"] = st.secrets["AZURE_API_KEY"]
 os.environ["AZURE_API_BASE"] = st.secrets["AZURE_API_BASE"]
 os.environ["AZURE_API_VERSION"] = "2025-01-01-preview"
  
-llm = AzureChatOpenAI(
-    azure_deployment="gpt-4.1-nano",
-    model_name="azure/gpt-4.1-nano",  # Your Azure deployment name
-    azure_endpoint=os.getenv("AZURE_API_BASE"),
-    api_key=os.getenv("AZURE_API_KEY"),
-    api_version="2025-01-01-preview",  # Your API version
-    temperature=0.7,
-    streaming=True,
-    model_kwargs={"stream_options": {"include_usage": True}}
-)  
-    
-
-
-# Initialize agents
-agents = TripAgents(llm)
+# Initialize agents; each one gets its model from the LLM routing table (planner, specialist, classifier, ...)
+agents = TripAgents(router=get_router())
+agent_registry = AgentRegistry(agents)
+full_trip_planner = FullTripPlanner(agent_registry)
 
 # Initialize guardrails
 guardrails = GuardrailManager()
@@ -145,10 +152,13 @@ def run_crew_with_location_context(crew):
             for key, value in location_data.items():
                 span.set_attribute(key, value)
             span.set_attribute("location_source", "auto_detected")        
-        # Execute the crew
-        result = crew.kickoff()
+        # Execute the crew; repeated tool calls across its agents are answered once
+        with crew_run() as memo:
+            result = crew.kickoff()
         
         # Add success metrics
+        span.set_attribute("tool_memo.hits", memo.hits)
+        span.set_attribute("tool_memo.misses", memo.misses)
         span.set_attribute("execution_status", "success")
         span.set_attribute("result_length", len(str(result)) if result else 0)
         
@@ -419,9 +429,28 @@ def city_selection_form():
                 
                 # Get city recommendations
                 with st.spinner("Getting city recommendations..."):
-                    city_expert = agents.city_selection_expert()
-                    city_classifier_expert = agents.city_classifier()
-                    city_justifier_expert = agents.city_justifier()
+                    city_expert = agent_registry.get("city_selection_expert")
+                    if FUSED_EVALUATION:
+                        evaluation_tasks = [{
+                            "description":"Classify if the city recommended below is Ideal or Not Ideal and justify it in two lines: \n\n'{{task_1_output}}'",
+                            "expected_output":'JSON object: {"label": "Ideal" or "Not Ideal", "justification": "two lines"}',
+                            "agent":agent_registry.get("city_evaluator")
+                        }]
+                    else:
+                        city_classifier_expert = agent_registry.get("city_classifier")
+                        city_justifier_expert = agent_registry.get("city_justifier")
+                        evaluation_tasks = [
+                            {
+                                "description":"Classify if the city recommended below is Ideal or Not Ideal: \n\n'{{task_1_output}}'",
+                                "expected_output":"Based on the recommended city classifiy if the city is either 'Ideal' or 'Not Ideal' place to visit",
+                                "agent":city_classifier_expert
+                            },
+                            {
+                                "description":"Explain in two lines why the city is '{{task_2_output}}' using the previous recommendation: '{{task_1_output}}'.",
+                                "expected_output":"Detailed justification",
+                                "agent":city_justifier_expert
+                            }
+                        ]
 
 
                     crew = Crew(
@@ -452,16 +481,7 @@ def city_selection_form():
                         "agent":city_expert
                     
                     },
-                    {
-                    "description":"Classify if the city recommended below is Ideal or Not Ideal: \n\n'{{task_1_output}}'",
-                        "expected_output":"Based on the recommended city classifiy if the city is either 'Ideal' or 'Not Ideal' place to visit",
-                        "agent":city_classifier_expert
-                    },
-                    {
-                        "description":"Explain in two lines why the city is '{{task_2_output}}' using the previous recommendation: '{{task_1_output}}'.",
-                        "expected_output":"Detailed justification",
-                        "agent":city_justifier_expert
-                    }
+                    *evaluation_tasks
                         ]
                     )
 
@@ -538,8 +558,7 @@ def city_selection_form():
                         st.session_state.selected_budget = budget
                         st.session_state.selected_preferences = preferences
                         st.session_state.duration = duration
-                        st.session_state.city_class= result.tasks_output[1].raw
-                        st.session_state.city_justify= result.tasks_output[2].raw
+                        st.session_state.city_class, st.session_state.city_justify = evaluation_outputs(result)
                         try:
                             print("******************************result.tasks_output[1]:",result.tasks_output[1],"$$",result.tasks_output[1])
                             print("******************************result.tasks_output[2]:",result.tasks_output[2])
@@ -651,14 +670,38 @@ def travel_planning_form():
                 
                 # Generate travel plan
                 with st.spinner("Generating your travel plan..."):
-                    travel_expert = agents.travel_planning_expert()
-                    trip_classifier_expert = agents.trip_classifier()
-                    trip_justifier_expert = agents.trip_justifier()
+                    travel_expert = agent_registry.get("travel_planning_expert")
+                    if FUSED_EVALUATION:
+                        trip_evaluator_expert = agent_registry.get("trip_evaluator")
+                        evaluation_agents = [trip_evaluator_expert]
+                        evaluation_tasks = [{
+                            "description":"Using the travel plan: '{{task_1_output}}', classify if the travel plan is 'Ideal' or 'Not Ideal' based on the budget, itinerary and recommendations, and justify it in two sentences",
+                            "expected_output":'JSON object: {"label": "Ideal" or "Not Ideal", "justification": "two sentences"}',
+                            "agent":trip_evaluator_expert
+                        }]
+                    else:
+                        trip_classifier_expert = agent_registry.get("trip_classifier")
+                        trip_justifier_expert = agent_registry.get("trip_justifier")
+                        evaluation_agents = [trip_classifier_expert,trip_justifier_expert]
+                        evaluation_tasks = [
+                            {
+                                "description":"Using the travel plan: '{{task_1_output}}', classify the if the travel plan identified is 'Ideal' or 'Not Ideal' basd on the budget,itinerary and recommendations",
+                                "expected_output":"Display either 'Ideal' or 'Not Ideal'",
+                                "agent":trip_classifier_expert
+                            },
+                            {
+                                "description":"Explain in two sentences why the travel plan is '{{task_2_output}}' using the previous recommendation: '{{task_1_output}}'",
+                                "expected_output":"Detailed justification",
+                                "agent":trip_justifier_expert
+                            }
+                        ]
                     
-                    crew = Crew(
-                        agents=[travel_expert,trip_classifier_expert,trip_justifier_expert],
-                        tasks=[{
-                            "description":f"""Create a detailed travel plan based on these preferences: {travel_input.dict()}
+                    if FULL_TRIP_PIPELINE:
+                        # Transportation, accommodation, dining and local-guide specialists run concurrently first
+                        specialists = full_trip_planner.run_specialists(travel_input, origin=(location_data or {}).get("city"))
+                        plan_description = merge_description(travel_input, specialists.specialist_outputs)
+                    else:
+                        plan_description = f"""Create a detailed travel plan based on these preferences: {travel_input.dict()}
                         Your response MUST be a valid JSON object with the following structure:
                         {{
                             "itinerary": [
@@ -692,21 +735,17 @@ def travel_planning_form():
                                 "Recommendation 1",
                                 "Recommendation 2"
                             ]
-                        }}""",
+                        }}"""
+
+                    crew = Crew(
+                        agents=[travel_expert,*evaluation_agents],
+                        tasks=[{
+                            "description":plan_description,
                         "agent":travel_expert,
                         "expected_output":"A detailed travel plan in JSON format as specified, with itinerary, budget, and recommendations."
 
                         },
-                        {
-                    "description":"Using the travel plan: '{{task_1_output}}', classify the if the travel plan identified is 'Ideal' or 'Not Ideal' basd on the budget,itinerary and recommendations",
-                        "expected_output":"Display either 'Ideal' or 'Not Ideal'",
-                        "agent":trip_classifier_expert
-                    },
-                    {
-                        "description":"Explain in two sentences why the travel plan is '{{task_2_output}}' using the previous recommendation: '{{task_1_output}}'",
-                        "expected_output":"Detailed justification",
-                        "agent":trip_justifier_expert
-                    }
+                        *evaluation_tasks
                         ],
                     sequential=True
                     )
@@ -757,8 +796,7 @@ def travel_planning_form():
                         return
                     
                     st.session_state.travel_plan = result_data
-                    st.session_state.travel_plan_class = result.tasks_output[1].raw
-                    st.session_state.travel_plan_justify = result.tasks_output[2].raw
+                    st.session_state.travel_plan_class, st.session_state.travel_plan_justify = evaluation_outputs(result)
                     display_travel_plan(st.session_state.travel_plan, st.session_state.travel_plan_class,st.session_state.travel_plan_justify)
                     # except json.JSONDecodeError:
                     #     st.error("Invalid response format from the AI. Please try again.")
@@ -0,0 +1,195 @@
+"""Full-trip planning: the four specialists in parallel, then one merge.
+
+Transportation, accommodation, dining and the local tour only need the
+traveller's request, not each other's answers, so each runs as its own
+single-task crew on a thread pool. ``travel_planning_expert`` then merges
+their notes into the final JSON plan, so the wall time is the slowest
+specialist plus the merge instead of the sum of all four.
+"""
+import contextvars
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from crewai import Crew
+from opentelemetry import trace
+
+from .agent_registry import AgentRegistry
+from .agents2 import TravelInput
+from .tasks import TravelTasks
+from .tools.run_memo import crew_run
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+# A specialist still running after this is left out of the merge rather than holding up the plan
+SPECIALIST_TIMEOUT = float(os.getenv("TRIP_PLANNER_SPECIALIST_TIMEOUT", "300"))
+
+TRAVEL_PLAN_FORMAT = """{
+    "itinerary": [
+        {
+            "activities": [
+                {
+                    "activity": "Activity name",
+                    "description": "Activity description",
+                    "location": "Location name",
+                    "duration": "2 hours",
+                    "cost": 50
+                }
+            ],
+            "meals": [
+                {
+                    "type": "Lunch",
+                    "suggestion": "Restaurant name",
+                    "cost": 30
+                }
+            ]
+        }
+    ],
+    "budget_breakdown": {
+        "accommodation": 500,
+        "food": 300,
+        "activities": 400,
+        "transportation": 200,
+        "total": 1400
+    },
+    "recommendations": [
+        "Recommendation 1",
+        "Recommendation 2"
+    ]
+}"""
+
+
+class SpecialistTask(NamedTuple):
+    agent: str
+    expected_output: str
+    describe: Callable[[TravelTasks, Any, TravelInput, str], str]
+
+
+def _date_range(travel_input: TravelInput) -> Dict[str, str]:
+    return {"start": travel_input.start_date, "end": travel_input.end_date}
+
+
+SPECIALIST_TASKS = (
+    SpecialistTask(
+        "transportation_specialist",
+        "Transportation plan with flights, local transit, travel times and costs.",
+        lambda tasks, agent, t, origin: tasks.plan_transportation(agent, origin, [t.destination], _date_range(t)),
+    ),
+    SpecialistTask(
+        "accommodation_expert",
+        "Accommodation recommendations with neighborhoods, price ranges and booking tips.",
+        lambda tasks, agent, t, origin: tasks.find_accommodation(agent, [t.destination], _date_range(t))
+        + f"\nPreferred accommodation type: {t.accommodation}",
+    ),
+    SpecialistTask(
+        "food_dining_guide",
+        "Restaurant and local food recommendations with prices per meal.",
+        lambda tasks, agent, t, origin: tasks.plan_dining(agent, [t.destination], _date_range(t), t.activities),
+    ),
+    SpecialistTask(
+        "local_tour_guide",
+        "City information: neighborhoods, attractions, customs and local tips.",
+        lambda tasks, agent, t, origin: tasks.gather_city_info(agent, [t.destination], _date_range(t), t.activities),
+    ),
+)
+
+
+def merge_description(travel_input: TravelInput, specialist_outputs: Dict[str, str]) -> str:
+    """Task for ``travel_planning_expert``: one JSON plan built from the specialists' notes."""
+    notes = "\n\n".join(
+        f"### {name}\n{output}" if output is not None else f"### {name}\n(not available, plan this part yourself)"
+        for name, output in specialist_outputs.items()
+    )
+    return f"""Create a detailed travel plan based on these preferences: {travel_input.dict()}
+Build it from the specialists' findings below instead of researching again; keep their prices and names.
+
+{notes}
+
+Your response MUST be a valid JSON object with the following structure:
+{TRAVEL_PLAN_FORMAT}"""
+
+
+class FullTripResult(NamedTuple):
+    plan: Any
+    specialist_outputs: Dict[str, Optional[str]]
+    timings: Dict[str, float]
+
+
+class FullTripPlanner:
+    """Runs ``SPECIALIST_TASKS`` concurrently and merges them with ``travel_planning_expert``."""
+
+    def __init__(self, registry: AgentRegistry, travel_tasks: Optional[TravelTasks] = None,
+                 max_workers: Optional[int] = None, timeout: float = SPECIALIST_TIMEOUT):
+        self.registry = registry
+        self.travel_tasks = travel_tasks or TravelTasks()
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or len(SPECIALIST_TASKS),
+                                            thread_name_prefix="trip-specialist")
+
+    def _run_specialist(self, specialist: SpecialistTask, travel_input: TravelInput, origin: str):
+        started = time.perf_counter()
+        with tracer.start_as_current_span(f"specialist-{specialist.agent}"):
+            agent = self.registry.get(specialist.agent)
+            crew = Crew(agents=[agent], tasks=[{
+                "description": specialist.describe(self.travel_tasks, agent, travel_input, origin),
+                "expected_output": specialist.expected_output,
+                "agent": agent,
+            }])
+            output = str(crew.kickoff())
+        return output, time.perf_counter() - started
+
+    def run_specialists(self, travel_input: TravelInput, origin: Optional[str] = None) -> FullTripResult:
+        """Every specialist's output (``None`` for one that failed or timed out) and its wall time.
+
+        Each specialist runs in a copy of the caller's context, so the tool
+        memo of an enclosing :func:`crew_run` and the current span are shared.
+        """
+        origin = origin or "Not specified"
+        futures = {
+            self._executor.submit(contextvars.copy_context().run, self._run_specialist, specialist, travel_input, origin):
+                specialist.agent
+            for specialist in SPECIALIST_TASKS
+        }
+        wait(futures, timeout=self.timeout)
+        outputs: Dict[str, Optional[str]] = {}
+        timings: Dict[str, float] = {}
+        span = trace.get_current_span()
+        for future, name in futures.items():
+            outputs[name] = None
+            if not future.done():
+                logger.warning("Specialist %s timed out after %.0fs", name, self.timeout)
+                continue
+            try:
+                outputs[name], timings[name] = future.result()
+                span.set_attribute(f"specialist.{name}.seconds", round(timings[name], 3))
+            except Exception as e:
+                logger.warning("Specialist %s failed: %s", name, e)
+        span.set_attribute("specialists.completed", sum(output is not None for output in outputs.values()))
+        return FullTripResult(None, outputs, timings)
+
+    def plan(self, travel_input: TravelInput, origin: Optional[str] = None) -> FullTripResult:
+        """Specialists in parallel, then the merge; the crew's result is in ``plan``."""
+        with tracer.start_as_current_span("full-trip-plan") as span, crew_run() as memo:
+            started = time.perf_counter()
+            result = self.run_specialists(travel_input, origin)
+            span.set_attribute("specialists.seconds", round(time.perf_counter() - started, 3))
+
+            merge_started = time.perf_counter()
+            travel_expert = self.registry.get("travel_planning_expert")
+            crew = Crew(agents=[travel_expert], tasks=[{
+                "description": merge_description(travel_input, result.specialist_outputs),
+                "expected_output": "A detailed travel plan in JSON format as specified, with itinerary, budget, and recommendations.",
+                "agent": travel_expert,
+            }])
+            plan = crew.kickoff()
+            result.timings["travel_planning_expert"] = time.perf_counter() - merge_started
+
+            span.set_attribute("tool_memo.hits", memo.hits)
+            span.set_attribute("tool_memo.misses", memo.misses)
+        return result._replace(plan=plan)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
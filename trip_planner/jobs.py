@@ -0,0 +1,234 @@
+"""Persistent job queue for agent runs, drained by a pool of worker threads.
+
+Jobs live in a SQLite table next to the tool cache, so a queued or
+half-finished run survives a restart: a running job whose worker stops
+heartbeating for ``JOB_LEASE_SECONDS`` (the process died) is claimed again,
+up to ``JOB_MAX_ATTEMPTS`` times. Several processes may share the database;
+claims are atomic. Crew runs spend their time waiting on LLM calls, so
+threads are enough and throughput scales with ``TRIP_PLANNER_JOB_WORKERS``.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from .telemetry import register_job_metrics
+from .tools.cache import DEFAULT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOBS_PATH = os.getenv("TRIP_PLANNER_JOBS_DB", os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), "jobs.sqlite3"))
+JOB_WORKERS = int(os.getenv("TRIP_PLANNER_JOB_WORKERS", "4"))
+JOB_LEASE_SECONDS = float(os.getenv("TRIP_PLANNER_JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("TRIP_PLANNER_JOB_MAX_ATTEMPTS", "3"))
+# Idle workers also wake this often to pick up jobs enqueued by other processes
+JOB_POLL_SECONDS = float(os.getenv("TRIP_PLANNER_JOB_POLL_SECONDS", "1.0"))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+STATUSES = (QUEUED, RUNNING, SUCCEEDED, FAILED)
+
+_COLUMNS = ("id", "agent", "input", "status", "result", "error", "attempts",
+            "created_at", "started_at", "finished_at")
+
+
+class JobQueue:
+    """Jobs table: enqueue, atomic claim with a heartbeat lease, and completion."""
+
+    def __init__(self, path: str = DEFAULT_JOBS_PATH, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, agent TEXT NOT NULL, input TEXT NOT NULL, status TEXT NOT NULL,"
+            " result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, owner TEXT,"
+            " created_at REAL NOT NULL, started_at REAL, finished_at REAL, heartbeat_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def enqueue(self, agent: str, input_data: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, agent, input, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, agent, json.dumps(input_data), QUEUED, time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["input"] = json.loads(job["input"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def claim(self, owner: str) -> Optional[Dict[str, Any]]:
+        """Oldest queued job, or a running one whose lease lapsed, marked running for ``owner``."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A lapsed job that already used up its attempts is failed rather than run again
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status = ? AND heartbeat_at < ?"
+                    " AND attempts >= ?",
+                    (FAILED, "worker lost", now, RUNNING, now - self.lease_seconds, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, agent, input, attempts FROM jobs"
+                    " WHERE status = ? OR (status = ? AND heartbeat_at < ?) ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now - self.lease_seconds),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, owner = ?, attempts = attempts + 1, started_at = ?,"
+                        " heartbeat_at = ? WHERE id = ?",
+                        (RUNNING, owner, now, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        if row[3]:
+            logger.warning("Retrying job %s (attempt %d): its previous worker stopped", row[0], row[3] + 1)
+        return {"id": row[0], "agent": row[1], "input": json.loads(row[2])}
+
+    def heartbeat(self, owner: str, job_ids: List[str]):
+        if not job_ids:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?"
+                f" AND id IN ({', '.join('?' * len(job_ids))})",
+                (time.time(), owner, RUNNING, *job_ids),
+            )
+
+    def complete(self, job_id: str, owner: str, result: Any):
+        self._finish(job_id, owner, SUCCEEDED, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: str, owner: str, error: str):
+        self._finish(job_id, owner, FAILED, error=error)
+
+    def _finish(self, job_id: str, owner: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None):
+        # Only the current owner may finish a job; a worker whose lease lapsed lost it to another
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?"
+                " WHERE id = ? AND owner = ? AND status = ?",
+                (status, result, error, time.time(), job_id, owner, RUNNING),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+
+class JobWorkerPool:
+    """``workers`` threads running ``handler(agent, input_data)`` for claimed jobs.
+
+    The handler's return value is stored as the job's result (JSON, with
+    ``str`` for anything else); an exception fails the job with its message.
+    """
+
+    def __init__(self, queue: JobQueue, handler: Callable[[str, Dict[str, Any]], Any],
+                 workers: int = JOB_WORKERS, poll_seconds: float = JOB_POLL_SECONDS):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._running: Dict[str, float] = {}
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def notify(self):
+        """Wake one idle worker, e.g. right after an enqueue in this process."""
+        with self._wakeup:
+            self._wakeup.notify()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming jobs; running ones finish unless ``timeout`` runs out (their lease then lapses)."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.queue.claim(self.owner)
+            except sqlite3.Error as e:
+                logger.warning("Job claim failed: %s", e)
+                job = None
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_seconds)
+                continue
+            self._running[job["id"]] = time.time()
+            try:
+                result = self.handler(job["agent"], job["input"])
+                self.queue.complete(job["id"], self.owner, result)
+            except Exception as e:
+                logger.warning("Job %s (%s) failed: %s", job["id"], job["agent"], e)
+                self.queue.fail(job["id"], self.owner, str(e))
+            finally:
+                self._running.pop(job["id"], None)
+
+    def _heartbeat(self):
+        while not self._stopping.wait(self.queue.lease_seconds / 3):
+            try:
+                self.queue.heartbeat(self.owner, list(self._running))
+            except sqlite3.Error as e:
+                logger.warning("Job heartbeat failed: %s", e)
+
+
+_queues: List[JobQueue] = []
+
+
+def _job_counts() -> Dict[str, int]:
+    totals = dict.fromkeys(STATUSES, 0)
+    for queue in _queues:
+        for status, count in queue.counts().items():
+            totals[status] += count
+    return totals
+
+
+def open_job_queue(path: str = DEFAULT_JOBS_PATH, **kwargs) -> JobQueue:
+    """A :class:`JobQueue` whose per-status job counts are exported as metrics."""
+    queue = JobQueue(path, **kwargs)
+    _queues.append(queue)
+    register_job_metrics(_job_counts)
+    return queue
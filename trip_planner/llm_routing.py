@@ -0,0 +1,282 @@
+"""Which model each agent and LLM-backed tool talks to.
+
+Routes name a model configuration (deployment, temperature, max_tokens,
+streaming); assignments map agent factories (``TripAgents`` method names)
+and tools (``classify_city`` ...) to a route. Planning runs on the
+``planner`` route while classification and justification can use a small,
+fast deployment. Override either table with ``TRIP_PLANNER_LLM_ROUTES``,
+a JSON object or the path of a JSON file::
+
+    {"routes": {"planner": {"deployment": "gpt-4.1", "temperature": 0.5},
+                "classifier": {"deployment": "gpt-4.1-nano", "max_tokens": 128}},
+     "assignments": {"budget_planner": "specialist"}}
+
+Agents get a crewAI ``LLM`` (:meth:`LLMRouter.agent_llm`), since crewAI
+rebuilds any LangChain model it is handed and drops its streaming flag and
+callbacks; the LangChain tools keep an ``AzureChatOpenAI``
+(:meth:`LLMRouter.chat_model`). Every call is timed per route and exported
+as ``trip_planner.llm.latency``.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from crewai import LLM
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_openai import AzureChatOpenAI
+
+from .telemetry import record_llm_latency, register_llm_route_metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEPLOYMENT = os.getenv("TRIP_PLANNER_LLM_DEPLOYMENT", "gpt-4.1-nano")
+DEFAULT_API_VERSION = "2025-01-01-preview"
+DEFAULT_ROUTE = "planner"
+
+
+class ModelRoute(NamedTuple):
+    deployment: str
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    streaming: bool = False
+
+
+DEFAULT_ROUTES: Dict[str, ModelRoute] = {
+    "planner": ModelRoute(DEFAULT_DEPLOYMENT, temperature=0.7, streaming=True),
+    "specialist": ModelRoute(DEFAULT_DEPLOYMENT, temperature=0.7, streaming=True),
+    # Short, deterministic answers; temperature 0 also makes them cacheable
+    "classifier": ModelRoute(DEFAULT_DEPLOYMENT, temperature=0.0, max_tokens=256),
+    "justifier": ModelRoute(DEFAULT_DEPLOYMENT, temperature=0.3, max_tokens=512),
+    "evaluator": ModelRoute(DEFAULT_DEPLOYMENT, temperature=0.0, max_tokens=512),
+}
+
+DEFAULT_ASSIGNMENTS: Dict[str, str] = {
+    "expert_travel_agent": "planner",
+    "city_selection_expert": "planner",
+    "travel_planning_expert": "planner",
+    "budget_planner": "planner",
+    "local_tour_guide": "specialist",
+    "transportation_specialist": "specialist",
+    "accommodation_expert": "specialist",
+    "food_dining_guide": "specialist",
+    "city_classifier": "classifier",
+    "trip_classifier": "classifier",
+    "city_justifier": "justifier",
+    "trip_justifier": "justifier",
+    "city_evaluator": "evaluator",
+    "trip_evaluator": "evaluator",
+    "classify_city": "classifier",
+    "classify_trip": "classifier",
+    "justify_city": "justifier",
+    "justify_trip": "justifier",
+    "evaluate_city": "evaluator",
+    "evaluate_trip": "evaluator",
+}
+
+
+def load_overrides(value: Optional[str] = None) -> Dict[str, Any]:
+    """Parsed ``TRIP_PLANNER_LLM_ROUTES``: inline JSON or a path to a JSON file."""
+    value = os.getenv("TRIP_PLANNER_LLM_ROUTES", "") if value is None else value
+    if not value.strip():
+        return {}
+    try:
+        if value.lstrip().startswith("{"):
+            return json.loads(value)
+        with open(value) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring TRIP_PLANNER_LLM_ROUTES: %s", e)
+        return {}
+
+
+class _RouteTimer(BaseCallbackHandler):
+    """Times LangChain model calls (invoke, batch, streaming) on one route."""
+
+    def __init__(self, router: "LLMRouter", route: str):
+        self.router = router
+        self.route = route
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        self._finish(run_id, ok=True)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._finish(run_id, ok=False)
+
+    def _finish(self, run_id: UUID, ok: bool):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.router.record(self.route, time.perf_counter() - started, ok)
+
+
+class LLMRouter:
+    """Builds and shares one chat model per route, and keeps per-route call latency."""
+
+    def __init__(self, routes: Optional[Dict[str, ModelRoute]] = None,
+                 assignments: Optional[Dict[str, str]] = None, overrides: Optional[Dict[str, Any]] = None):
+        self.routes = dict(DEFAULT_ROUTES if routes is None else routes)
+        self.assignments = dict(DEFAULT_ASSIGNMENTS if assignments is None else assignments)
+        overrides = load_overrides() if overrides is None else overrides
+        for name, config in overrides.get("routes", {}).items():
+            base = self.routes.get(name, ModelRoute(DEFAULT_DEPLOYMENT))
+            self.routes[name] = base._replace(**{k: v for k, v in config.items() if k in ModelRoute._fields})
+        self.assignments.update(overrides.get("assignments", {}))
+        self._models: Dict[str, Any] = {}
+        self._agent_llms: Dict[Tuple[str, bool], LLM] = {}
+        self._llm_routes: Dict[int, str] = {}
+        self._roles: Dict[str, str] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def route_for(self, name: str) -> str:
+        """Route for an agent factory or tool name (or a route name itself)."""
+        if name in self.routes:
+            return name
+        route = self.assignments.get(name, DEFAULT_ROUTE)
+        return route if route in self.routes else DEFAULT_ROUTE
+
+    def chat_model(self, name: str) -> AzureChatOpenAI:
+        """Shared LangChain chat model for ``name``'s route (for tools), built on first use from the Azure env settings."""
+        route = self.route_for(name)
+        model = self._models.get(route)
+        if model is None:
+            with self._lock:
+                model = self._models.get(route)
+                if model is None:
+                    model = self._models[route] = self._build(route)
+        return model
+
+    def _build(self, route: str) -> AzureChatOpenAI:
+        config = self.routes[route]
+        kwargs: Dict[str, Any] = {}
+        if config.streaming:
+            kwargs["model_kwargs"] = {"stream_options": {"include_usage": True}}
+        return AzureChatOpenAI(
+            azure_deployment=config.deployment,
+            model_name=f"azure/{config.deployment}",
+            azure_endpoint=os.getenv("AZURE_API_BASE"),
+            api_key=os.getenv("AZURE_API_KEY"),
+            api_version=os.getenv("AZURE_API_VERSION", DEFAULT_API_VERSION),
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
+            streaming=config.streaming,
+            callbacks=[_RouteTimer(self, route)],
+            **kwargs,
+        )
+
+    def agent_llm(self, name: str, stream: Optional[bool] = None) -> LLM:
+        """Shared crewAI LLM for ``name``'s route; ``stream`` overrides the route's ``streaming``."""
+        route = self.route_for(name)
+        key = (route, self.routes[route].streaming if stream is None else stream)
+        llm = self._agent_llms.get(key)
+        if llm is None:
+            with self._lock:
+                llm = self._agent_llms.get(key)
+                if llm is None:
+                    llm = self._agent_llms[key] = self._build_agent_llm(*key)
+                    self._llm_routes[id(llm)] = route
+        return llm
+
+    def _build_agent_llm(self, route: str, stream: bool) -> LLM:
+        config = self.routes[route]
+        kwargs: Dict[str, Any] = {}
+        if config.temperature is not None:
+            kwargs["temperature"] = config.temperature
+        if config.max_tokens is not None:
+            kwargs["max_tokens"] = config.max_tokens
+        return LLM(
+            model=f"azure/{config.deployment}",
+            api_base=os.getenv("AZURE_API_BASE"),
+            api_key=os.getenv("AZURE_API_KEY"),
+            api_version=os.getenv("AZURE_API_VERSION", DEFAULT_API_VERSION),
+            stream=stream,
+            **kwargs,
+        )
+
+    def route_for_llm(self, llm: Any) -> Optional[str]:
+        """Route of an LLM built by :meth:`agent_llm`, or ``None`` for any other."""
+        return self._llm_routes.get(id(llm))
+
+    def register_role(self, role: str, name: str):
+        """Attribute crewAI LLM events from agents with this role to ``name``'s route."""
+        self._roles[role] = self.route_for(name)
+
+    def route_for_role(self, role: Optional[str]) -> Optional[str]:
+        return self._roles.get(role) if role else None
+
+    def record(self, route: str, seconds: float, ok: bool = True):
+        with self._lock:
+            stats = self._stats.setdefault(route, {"calls": 0, "errors": 0, "seconds": 0.0})
+            stats["calls"] += 1
+            stats["errors"] += not ok
+            stats["seconds"] += seconds
+        record_llm_latency(route, self.routes[route].deployment, seconds, ok)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route call count, error count and mean latency in seconds."""
+        with self._lock:
+            return {
+                route: {
+                    "deployment": self.routes[route].deployment,
+                    "calls": int(s["calls"]),
+                    "errors": int(s["errors"]),
+                    "mean_seconds": round(s["seconds"] / s["calls"], 4) if s["calls"] else 0.0,
+                }
+                for route, s in self._stats.items()
+            }
+
+
+def _listen_to_crewai(router: LLMRouter):
+    # crewAI emits LLM call events with the LLM as the source, for its native clients and LiteLLM alike; agents
+    # pinned to an LLM of their own are attributed by role instead
+    try:
+        from crewai.events import crewai_event_bus, LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+    except ImportError:
+        return
+    started: Dict[str, Tuple[str, Any]] = {}
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def _on_started(source, event):
+        route = router.route_for_llm(source) or router.route_for_role(event.agent_role)
+        if route:
+            started[event.call_id] = (route, event.timestamp)
+
+    def _finish(event, ok: bool):
+        route, start = started.pop(event.call_id, (None, None))
+        if route:
+            router.record(route, (event.timestamp - start).total_seconds(), ok)
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def _on_completed(source, event):
+        _finish(event, ok=True)
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def _on_failed(source, event):
+        _finish(event, ok=False)
+
+
+_router: Optional[LLMRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> LLMRouter:
+    """Process-wide router configured from the defaults and ``TRIP_PLANNER_LLM_ROUTES``."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                router = LLMRouter()
+                _listen_to_crewai(router)
+                register_llm_route_metrics(router.stats)
+                _router = router
+    return _router
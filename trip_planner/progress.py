@@ -0,0 +1,157 @@
+"""Live progress of crew runs, for server-sent events.
+
+crewAI announces task starts and ends, tool calls and streamed LLM chunks on
+its global event bus. ``ProgressHub`` listens once per process and hands
+each event to the stream of the request whose agent produced it. Agents
+from ``AgentRegistry.get`` carry a fresh id, so concurrent runs of the same
+agent never see each other's progress. Token events only come from agents
+whose LLM streams (``AgentRegistry.get(name, stream=True)``). crewAI may
+dispatch handlers on its own threads, so events close together can reach a
+stream out of order.
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sent when nothing else was for this long, so proxies keep the connection open
+KEEPALIVE_SECONDS = 15.0
+
+_CLOSE = object()
+
+
+def sse_message(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _agent_id(event: Any) -> Optional[str]:
+    agent_id = getattr(event, "agent_id", None)
+    if agent_id:
+        return str(agent_id)
+    for source in (getattr(event, "from_agent", None), getattr(event, "agent", None),
+                   getattr(getattr(event, "task", None), "agent", None)):
+        if getattr(source, "id", None) is not None:
+            return str(source.id)
+    return None
+
+
+class ProgressStream:
+    """Events for one request, pushed from crewAI's threads and read on the event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def push(self, event: str, data: Dict[str, Any]):
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (event, data))
+        except RuntimeError:
+            # The loop is gone (server shutting down); nobody is listening anymore
+            pass
+
+    def close(self):
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, _CLOSE)
+        except RuntimeError:
+            pass
+
+    async def messages(self, keepalive: float = KEEPALIVE_SECONDS) -> AsyncIterator[str]:
+        """SSE-formatted messages until :meth:`close`, with keep-alive comments in quiet periods."""
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is _CLOSE:
+                return
+            yield sse_message(*item)
+
+
+class ProgressHub:
+    """Routes crewAI events to the :class:`ProgressStream` subscribed to the emitting agent."""
+
+    def __init__(self):
+        self._streams: Dict[str, ProgressStream] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, agent_ids: Iterable[Any], stream: ProgressStream):
+        with self._lock:
+            for agent_id in agent_ids:
+                self._streams[str(agent_id)] = stream
+
+    def unsubscribe(self, agent_ids: Iterable[Any]):
+        with self._lock:
+            for agent_id in agent_ids:
+                self._streams.pop(str(agent_id), None)
+
+    def publish(self, source_event: Any, event: str, data: Dict[str, Any]):
+        agent_id = _agent_id(source_event)
+        if agent_id is None:
+            return
+        with self._lock:
+            stream = self._streams.get(agent_id)
+        if stream is not None:
+            stream.push(event, data)
+
+
+def _listen_to_crewai(hub: ProgressHub):
+    try:
+        from crewai.events import (
+            crewai_event_bus, LLMStreamChunkEvent, TaskCompletedEvent, TaskStartedEvent,
+            ToolUsageErrorEvent, ToolUsageFinishedEvent, ToolUsageStartedEvent,
+        )
+    except ImportError:
+        logger.warning("crewAI event bus unavailable; progress streams will carry only the final result")
+        return
+
+    def task_name(event):
+        return getattr(event, "task_name", None) or getattr(getattr(event, "task", None), "name", None)
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def _on_task_started(source, event):
+        hub.publish(event, "task_started", {"task": task_name(event), "agent": event.agent_role})
+
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def _on_task_completed(source, event):
+        output = getattr(event.output, "raw", event.output)
+        hub.publish(event, "task_completed", {"task": task_name(event), "agent": event.agent_role, "output": output})
+
+    @crewai_event_bus.on(ToolUsageStartedEvent)
+    def _on_tool_started(source, event):
+        hub.publish(event, "tool_started", {"tool": event.tool_name, "args": event.tool_args})
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def _on_tool_finished(source, event):
+        hub.publish(event, "tool_finished", {
+            "tool": event.tool_name,
+            "duration_ms": round((event.finished_at - event.started_at).total_seconds() * 1000, 1),
+            "from_cache": event.from_cache,
+        })
+
+    @crewai_event_bus.on(ToolUsageErrorEvent)
+    def _on_tool_error(source, event):
+        hub.publish(event, "tool_error", {"tool": event.tool_name, "error": str(event.error)})
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _on_token(source, event):
+        hub.publish(event, "token", {"text": event.chunk})
+
+
+_hub: Optional[ProgressHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_progress_hub() -> ProgressHub:
+    """Process-wide hub, listening to crewAI's event bus from the first call on."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                hub = ProgressHub()
+                _listen_to_crewai(hub)
+                _hub = hub
+    return _hub
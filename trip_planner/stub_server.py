@@ -0,0 +1,512 @@
+"""Local stand-in for every third-party API the travel tools call.
+
+Serves deterministic, realistically shaped fixtures for OpenTripMap,
+WeatherAPI, Eventbrite, ExchangeRate-API, Aviation Stack, TransitLand,
+DuckDuckGo HTML and OpenAI-compatible chat completions, with injectable
+latency, error rates and rate limiting.
+Point the tools at it with ``TRIP_PLANNER_STUB_URL``; upstream URLs are
+rewritten to ``<stub>/<original host>/<path>``.
+
+    python -m trip_planner.stub_server --port 8765 --latency lognormal:80:0.5 --error-rate 0.05
+    TRIP_PLANNER_STUB_URL=http://127.0.0.1:8765 streamlit run streamlit_app.py
+
+Per-host overrides go in a JSON file passed with ``--config``::
+
+    {"default": {"latency": "fixed:20"},
+     "hosts": {"api.weatherapi.com": {"latency": "uniform:100:400", "error_rate": 0.1, "rate_limit": 5}}}
+"""
+import argparse
+import html
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+from trip_planner.tools.airports import get_airport_index
+
+Response = Tuple[int, str, bytes]
+
+CONDITIONS = ["Sunny", "Partly cloudy", "Cloudy", "Overcast", "Patchy rain possible", "Light rain", "Moderate rain", "Clear"]
+POI_KINDS = [
+    "interesting_places,cultural,museums", "interesting_places,architecture,historic_architecture",
+    "interesting_places,religion,churches", "foods,restaurants", "tourist_facilities,transport",
+    "natural,gardens_and_parks", "amusements,theatres_and_entertainments", "accomodations,other_hotels",
+]
+EVENT_KINDS = ["Jazz Night", "Food Market", "Art Walk", "Film Festival", "Street Fair", "Wine Tasting", "Marathon", "Design Week"]
+AIRLINES = [("TAP Air Portugal", "TP"), ("Iberia", "IB"), ("Lufthansa", "LH"), ("Air France", "AF"),
+            ("Delta Air Lines", "DL"), ("Emirates", "EK"), ("Japan Airlines", "JL"), ("Qantas", "QF")]
+
+
+def _rng(*parts: Any) -> random.Random:
+    """Random source seeded by the request, so the same query always gets the same fixture."""
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode("utf-8")))
+
+
+def _json(body: Any, status: int = 200) -> Response:
+    return status, "application/json", json.dumps(body).encode("utf-8")
+
+
+def _first(query: Dict[str, list], name: str, default: str = "") -> str:
+    return query.get(name, [default])[0]
+
+
+def _place(name: str):
+    return get_airport_index().by_city(name)
+
+
+# --- fixtures, keyed by (upstream host, path prefix) -------------------------------------------
+
+def opentripmap_geoname(path: str, query: Dict[str, list]) -> Response:
+    name = _first(query, "name")
+    airport = _place(name)
+    if airport is None:
+        return _json({"error": "Not found"}, 404)
+    return _json({
+        "name": airport.city, "country": airport.country, "lat": airport.lat, "lon": airport.lon,
+        "population": _rng("pop", airport.city).randint(80_000, 9_000_000),
+        "timezone": "UTC", "status": "OK",
+    })
+
+
+def opentripmap_radius(path: str, query: Dict[str, list]) -> Response:
+    lat, lon = float(_first(query, "lat", "0")), float(_first(query, "lon", "0"))
+    rng = _rng("radius", round(lat, 3), round(lon, 3))
+    features = []
+    for i in range(rng.randint(6, 14)):
+        features.append({
+            "type": "Feature",
+            "id": str(rng.randint(10**6, 10**7)),
+            "geometry": {"type": "Point", "coordinates": [lon + rng.uniform(-0.008, 0.008), lat + rng.uniform(-0.008, 0.008)]},
+            "properties": {
+                "xid": f"N{rng.randint(10**8, 10**9)}", "name": f"Point of interest {i + 1}",
+                "dist": round(rng.uniform(20, float(_first(query, "radius", "1000"))), 2),
+                "rate": rng.randint(1, 7), "osm": f"node/{rng.randint(10**8, 10**9)}",
+                "kinds": rng.choice(POI_KINDS),
+            },
+        })
+    return _json({"type": "FeatureCollection", "features": features})
+
+
+def weatherapi_forecast(path: str, query: Dict[str, list]) -> Response:
+    name = _first(query, "q")
+    airport = _place(name)
+    if airport is None:
+        return _json({"error": {"code": 1006, "message": "No matching location found."}}, 400)
+    start = _first(query, "dt") or datetime.now().strftime("%Y-%m-%d")
+    days = max(1, min(14, int(_first(query, "days", "1") or 1)))
+    # Warmer towards the equator, plus a deterministic per-day wobble
+    base = 28 - abs(airport.lat) * 0.35
+    forecastday = []
+    for offset in range(days):
+        date = (datetime.strptime(start, "%Y-%m-%d") + timedelta(days=offset)).strftime("%Y-%m-%d")
+        rng = _rng("weather", airport.iata, date)
+        avg = round(base + rng.uniform(-4, 4), 1)
+        forecastday.append({
+            "date": date,
+            "day": {
+                "maxtemp_c": round(avg + rng.uniform(2, 6), 1), "mintemp_c": round(avg - rng.uniform(2, 6), 1),
+                "avgtemp_c": avg, "maxwind_kph": round(rng.uniform(5, 40), 1),
+                "avghumidity": rng.randint(35, 90), "daily_chance_of_rain": rng.randint(0, 100),
+                "condition": {"text": rng.choice(CONDITIONS)},
+            },
+        })
+    today = forecastday[0]["day"]
+    rng = _rng("current", airport.iata, start)
+    return _json({
+        "location": {"name": airport.city, "country": airport.country, "lat": airport.lat, "lon": airport.lon,
+                     "localtime": f"{start} 12:00"},
+        "current": {
+            "last_updated": f"{start} 12:00", "temp_c": today["avgtemp_c"],
+            "condition": {"text": today["condition"]["text"]},
+            "humidity": today["avghumidity"], "wind_kph": round(rng.uniform(3, today["maxwind_kph"]), 1),
+        },
+        "forecast": {"forecastday": forecastday},
+    })
+
+
+def eventbrite_search(path: str, query: Dict[str, list]) -> Response:
+    lat, lon = _first(query, "location.latitude", "0"), _first(query, "location.longitude", "0")
+    start = _first(query, "start_date.range_start") or datetime.now().strftime("%Y-%m-%d")
+    end = _first(query, "start_date.range_end") or start
+    rng = _rng("events", lat, lon, start, end)
+    first = datetime.strptime(start[:10], "%Y-%m-%d")
+    span = max(0, (datetime.strptime(end[:10], "%Y-%m-%d") - first).days)
+    events = []
+    for i in range(rng.randint(3, 10)):
+        when = first + timedelta(days=rng.randint(0, span), hours=rng.randint(10, 22))
+        event_id = rng.randint(10**11, 10**12)
+        events.append({
+            "id": str(event_id),
+            "name": {"text": f"{rng.choice(EVENT_KINDS)} {i + 1}"},
+            "start": {"local": when.strftime("%Y-%m-%dT%H:%M:%S")},
+            "venue": {"name": f"Venue {rng.randint(1, 40)}"},
+            "url": f"https://www.eventbrite.com/e/{event_id}",
+        })
+    return _json({"pagination": {"object_count": len(events)}, "events": events})
+
+
+# Units per US dollar, roughly market rates; fixed so budget totals are plausible and reproducible
+USD_RATES: Dict[str, float] = {
+    "AED": 3.6725, "AFN": 70.5, "ALL": 92.5, "AMD": 387, "ANG": 1.79, "AOA": 912, "ARS": 1000, "AUD": 1.52,
+    "AWG": 1.79, "AZN": 1.7, "BAM": 1.8, "BBD": 2, "BDT": 119.5, "BGN": 1.8, "BHD": 0.376, "BIF": 2900,
+    "BMD": 1, "BND": 1.33, "BOB": 6.91, "BRL": 5.45, "BSD": 1, "BTN": 84, "BWP": 13.4, "BYN": 3.27,
+    "BZD": 2, "CAD": 1.37, "CDF": 2850, "CHF": 0.86, "CLP": 940, "CNY": 7.18, "COP": 4100, "CRC": 510,
+    "CUP": 24, "CVE": 101.5, "CZK": 23, "DJF": 177.7, "DKK": 6.87, "DOP": 60, "DZD": 133, "EGP": 48.5,
+    "ERN": 15, "ETB": 125, "EUR": 0.92, "FJD": 2.25, "FKP": 0.78, "GBP": 0.78, "GEL": 2.72, "GHS": 15.5,
+    "GIP": 0.78, "GMD": 70, "GNF": 8620, "GTQ": 7.73, "GYD": 209, "HKD": 7.8, "HNL": 25, "HTG": 131.5,
+    "HUF": 365, "IDR": 15800, "ILS": 3.7, "INR": 84, "IQD": 1310, "IRR": 42000, "ISK": 137, "JMD": 158,
+    "JOD": 0.709, "JPY": 150, "KES": 129, "KGS": 86, "KHR": 4060, "KMF": 452, "KPW": 900, "KRW": 1380,
+    "KWD": 0.307, "KYD": 0.833, "KZT": 485, "LAK": 21900, "LBP": 89500, "LKR": 293, "LRD": 190, "LSL": 17.8,
+    "LYD": 4.8, "MAD": 9.9, "MDL": 17.9, "MGA": 4600, "MKD": 56.6, "MMK": 2100, "MNT": 3400, "MOP": 8.03,
+    "MRU": 39.8, "MUR": 46, "MVR": 15.4, "MWK": 1735, "MXN": 19.5, "MYR": 4.4, "MZN": 63.9, "NAD": 17.8,
+    "NGN": 1600, "NIO": 36.8, "NOK": 10.9, "NPR": 134.5, "NZD": 1.66, "OMR": 0.385, "PAB": 1, "PEN": 3.76,
+    "PGK": 3.95, "PHP": 57.5, "PKR": 278, "PLN": 3.97, "PYG": 7800, "QAR": 3.64, "RON": 4.58, "RSD": 108,
+    "RUB": 95, "RWF": 1350, "SAR": 3.75, "SBD": 8.35, "SCR": 13.8, "SDG": 600, "SEK": 10.6, "SGD": 1.33,
+    "SHP": 0.78, "SLE": 22.5, "SOS": 571, "SRD": 33, "SSP": 2700, "STN": 22.6, "SYP": 13000, "SZL": 17.8,
+    "THB": 34, "TJS": 10.7, "TMT": 3.5, "TND": 3.1, "TOP": 2.35, "TRY": 34.2, "TTD": 6.78, "TWD": 32.3,
+    "TZS": 2700, "UAH": 41.2, "UGX": 3680, "USD": 1, "UYU": 41.5, "UZS": 12800, "VES": 39, "VND": 25300,
+    "VUV": 119, "WST": 2.72, "XAF": 603, "XCD": 2.7, "XOF": 603, "XPF": 109.7, "YER": 250, "ZAR": 17.8,
+    "ZMW": 26.5, "ZWL": 322,
+}
+
+
+def exchangerate_latest(path: str, query: Dict[str, list]) -> Response:
+    base = path.rstrip("/").rsplit("/", 1)[-1].upper() or "USD"
+    if base not in USD_RATES:
+        return _json({"result": "error", "error-type": "unsupported-code"}, status=404)
+    # Cross rates through the dollar, as the real API quotes any base
+    rates = {code: 1.0 if code == base else round(rate / USD_RATES[base], 6) for code, rate in USD_RATES.items()}
+    return _json({"result": "success", "base_code": base, "time_last_update_unix": int(time.time()),
+                  "conversion_rates": rates})
+
+
+def _flight_leg(rng: random.Random, airport, when: datetime, delay: Optional[int]) -> Dict[str, Any]:
+    scheduled = when.strftime("%Y-%m-%dT%H:%M:00+00:00")
+    return {
+        "airport": f"{airport.city} International", "timezone": None, "iata": airport.iata,
+        "icao": None, "terminal": str(rng.randint(1, 3)), "gate": f"{rng.choice('ABCDE')}{rng.randint(1, 40)}",
+        "delay": delay, "scheduled": scheduled, "estimated": scheduled, "actual": None,
+        "estimated_runway": None, "actual_runway": None,
+    }
+
+
+def aviationstack_flights(path: str, query: Dict[str, list]) -> Response:
+    # Same record shape as the real /v1/flights, which pages 100 records at a time
+    dep, arr = _first(query, "dep_iata").upper(), _first(query, "arr_iata").upper()
+    airports = get_airport_index()
+    dep_airport, arr_airport = airports.by_code(dep), airports.by_code(arr)
+    if dep_airport is None or arr_airport is None:
+        return _json({"pagination": {"limit": 100, "offset": 0, "count": 0, "total": 0}, "data": []})
+    date = _first(query, "flight_date") or datetime.now().strftime("%Y-%m-%d")
+    rng = _rng("flights", dep, arr, date)
+    flights = []
+    for _ in range(rng.randint(4, 40)):
+        airline, code = rng.choice(AIRLINES)
+        number = str(rng.randint(100, 9999))
+        departs = datetime.strptime(date, "%Y-%m-%d") + timedelta(minutes=rng.randint(6 * 60, 22 * 60))
+        arrives = departs + timedelta(minutes=rng.randint(60, 14 * 60))
+        delay = rng.choice([None, None, 5, 15, 40])
+        flights.append({
+            "flight_date": date, "flight_status": "scheduled",
+            "departure": _flight_leg(rng, dep_airport, departs, delay),
+            "arrival": dict(_flight_leg(rng, arr_airport, arrives, delay), baggage=None),
+            "airline": {"name": airline, "iata": code, "icao": None},
+            "flight": {"number": number, "iata": f"{code}{number}", "icao": None, "codeshared": None},
+            "aircraft": None, "live": None,
+        })
+    return _json({"pagination": {"limit": 100, "offset": 0, "count": len(flights), "total": len(flights)},
+                  "data": flights})
+
+
+def transitland_routes(path: str, query: Dict[str, list]) -> Response:
+    lat, lon = _first(query, "lat", "0"), _first(query, "lon", "0")
+    rng = _rng("routes", lat, lon)
+    routes = []
+    for i in range(rng.randint(4, 30)):
+        route_type = rng.choice([0, 1, 3, 3, 3])
+        # Route shapes dominate the real payload size
+        start_lon, start_lat = float(lon) + rng.uniform(-0.01, 0.01), float(lat) + rng.uniform(-0.01, 0.01)
+        line = [[round(start_lon + k * rng.uniform(-0.002, 0.002), 6), round(start_lat + k * rng.uniform(-0.002, 0.002), 6)]
+                for k in range(rng.randint(20, 120))]
+        onestop_id = f"r-{rng.getrandbits(40):010x}-{i}"
+        routes.append({
+            "id": rng.randint(10**5, 10**6),
+            "onestop_id": onestop_id,
+            "route_id": str(rng.randint(1, 999)),
+            "route_short_name": str(rng.randint(1, 99)),
+            "route_long_name": f"Line {i + 1}",
+            "route_type": route_type,
+            "route_color": f"{rng.getrandbits(24):06X}",
+            "route_text_color": "FFFFFF",
+            "route_desc": "",
+            "route_url": f"https://transit.example/routes/{onestop_id}",
+            "continuous_pickup": None,
+            "continuous_drop_off": None,
+            "geometry": {"type": "MultiLineString", "coordinates": [line]},
+            "agency": {"id": rng.randint(1, 500), "agency_id": "1", "agency_name": "Metro Transit",
+                       "onestop_id": "o-metro~transit"},
+            "feed_version": {"id": rng.randint(1, 9999), "sha1": f"{rng.getrandbits(160):040x}",
+                             "feed": {"id": rng.randint(1, 999), "onestop_id": "f-metro~transit"}},
+        })
+    return _json({"routes": routes})
+
+
+def duckduckgo_html(path: str, query: Dict[str, list]) -> Response:
+    q = _first(query, "q")
+    rng = _rng("search", q)
+    words = q.split() or ["travel"]
+    blocks = []
+    for i in range(10):
+        target = f"https://www.example{i}.com/{quote('-'.join(words).lower())}/{rng.randint(1, 999)}"
+        href = "//duckduckgo.com/l/?uddg=" + quote(target, safe="") + f"&amp;rut={rng.getrandbits(64):016x}"
+        title = html.escape(" ".join(rng.sample(words, len(words))).title() + f" - Guide {i + 1}")
+        snippet = html.escape(f"Everything about {q}: tips, prices and reviews, updated {2020 + i % 6}.")
+        blocks.append(
+            f'<div class="result results_links results_links_deep web-result "><div class="links_main links_deep result__body">'
+            f'<h2 class="result__title"><a rel="nofollow" class="result__a" href="{href}">{title}</a></h2>'
+            f'<div class="result__extras"><div class="result__extras__url"><a class="result__url" href="{href}">example{i}.com</a></div></div>'
+            f'<a class="result__snippet" href="{href}">{snippet}</a><div class="clear"></div></div></div>'
+        )
+    page = (f"<!DOCTYPE html><html><head><title>{html.escape(q)} at DuckDuckGo</title></head><body>"
+            f'<div class="serp__results"><div id="links" class="results">{"".join(blocks)}</div></div></body></html>')
+    return 200, "text/html; charset=utf-8", page.encode("utf-8")
+
+
+def openai_chat_completions(path: str, body: Dict[str, Any]) -> Response:
+    """Chat completion with a verdict derived from the prompt, shaped for the classify/justify/evaluate prompts."""
+    messages = body.get("messages") or [{}]
+    prompt = messages[-1].get("content") or ""
+    if not isinstance(prompt, str):
+        prompt = " ".join(part.get("text", "") for part in prompt if isinstance(part, dict))
+    rng = _rng("chat", body.get("model"), prompt)
+    label = rng.choice(["Ideal", "Ideal", "Not Ideal"])
+    reason = rng.choice(["the daily costs fit the budget", "the highlights match the stated interests",
+                         "costs run well above the budget", "the season is a poor fit"])
+    if '"label"' in prompt:
+        content = json.dumps({"label": label, "justification": f"It is {label} because {reason}."})
+    elif "Explain why" in prompt:
+        content = f"It is {label} because {reason}."
+    else:
+        content = label
+    prompt_tokens, completion_tokens = len(prompt) // 4 + 1, len(content) // 4 + 1
+    return _json({
+        "id": f"chatcmpl-{rng.getrandbits(48):012x}", "object": "chat.completion", "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    })
+
+
+ROUTES: Dict[str, Dict[str, Callable[[str, Dict[str, list]], Response]]] = {
+    "api.opentripmap.com": {"/0.1/en/places/geoname": opentripmap_geoname, "/0.1/en/places/radius": opentripmap_radius},
+    "api.weatherapi.com": {"/v1/forecast.json": weatherapi_forecast},
+    "www.eventbriteapi.com": {"/v3/events/search": eventbrite_search},
+    "v6.exchangerate-api.com": {"/v6/": exchangerate_latest},
+    "api.aviationstack.com": {"/v1/flights": aviationstack_flights},
+    "transit.land": {"/api/v2/routes": transitland_routes},
+    "duckduckgo.com": {"/html": duckduckgo_html},
+    "html.duckduckgo.com": {"/html": duckduckgo_html},
+}
+
+# POST handlers take the decoded JSON body instead of the query string
+POST_ROUTES: Dict[str, Dict[str, Callable[[str, Dict[str, Any]], Response]]] = {
+    "api.openai.com": {"/v1/chat/completions": openai_chat_completions},
+}
+
+
+# --- fault injection ---------------------------------------------------------------------------
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """Latency sampler in seconds from ``fixed:MS``, ``uniform:LO:HI``, ``normal:MEAN:SD``,
+    ``lognormal:MEDIAN:SIGMA`` or ``exponential:MEAN`` (all in milliseconds)."""
+    kind, _, rest = (spec or "fixed:0").partition(":")
+    args = [float(a) for a in rest.split(":") if a] if rest else []
+    if kind == "fixed" or kind.replace(".", "", 1).isdigit():
+        ms = args[0] if args else float(kind)
+        return lambda rng: ms / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1])) / 1000
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(args[0]), args[1]) / 1000
+    if kind == "exponential":
+        return lambda rng: rng.expovariate(1 / args[0]) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec!r}")
+
+
+class UpstreamProfile:
+    """How one stubbed upstream misbehaves: latency, random failures and a request-rate cap."""
+
+    def __init__(self, latency: str = "fixed:0", error_rate: float = 0.0, error_status: int = 503,
+                 rate_limit: Optional[float] = None, burst: Optional[int] = None):
+        self.latency = latency
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.burst = burst or (max(1, int(rate_limit)) if rate_limit else 0)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take_token(self) -> bool:
+        """Token-bucket check; False means the request should get a 429."""
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_limit)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class StubConfig:
+    def __init__(self, default: Optional[UpstreamProfile] = None,
+                 hosts: Optional[Dict[str, UpstreamProfile]] = None, seed: Optional[int] = None):
+        self.default = default or UpstreamProfile()
+        self.hosts = hosts or {}
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], seed: Optional[int] = None) -> "StubConfig":
+        return cls(
+            default=UpstreamProfile(**data.get("default", {})),
+            hosts={host: UpstreamProfile(**profile) for host, profile in data.get("hosts", {}).items()},
+            seed=seed,
+        )
+
+    def profile(self, host: str) -> UpstreamProfile:
+        return self.hosts.get(host, self.default)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops bursts of new connections, which then retry after a 1s SYN timeout
+    request_queue_size = 256
+
+    def __init__(self, address, config: StubConfig):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self.counters_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, host: str, outcome: str):
+        with self.counters_lock:
+            entry = self.counters.setdefault(host, {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "not_found": 0})
+            entry["requests"] += 1
+            entry[outcome] += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # allow keep-alive
+    disable_nagle_algorithm = True  # otherwise delayed ACKs add ~40ms per keep-alive response
+    server: StubServer
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/__stub__/stats":
+            with self.server.counters_lock:
+                return self._send(*_json(self.server.counters))
+        self._serve(ROUTES, parts.path, parse_qs(parts.query))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._send(*_json({"error": "request body is not JSON"}, 400))
+        self._serve(POST_ROUTES, urlsplit(self.path).path, payload)
+
+    def _serve(self, routes: Dict[str, Dict[str, Callable]], full_path: str, request: Any):
+        host, _, path = full_path.lstrip("/").partition("/")
+        path = "/" + path
+        handler = next((fn for prefix, fn in routes.get(host, {}).items() if path.startswith(prefix)), None)
+        config = self.server.config
+        profile = config.profile(host)
+        with config.rng_lock:
+            delay = profile.sample_latency(config.rng)
+            fail = config.rng.random() < profile.error_rate
+        if delay:
+            time.sleep(delay)
+        if handler is None:
+            self.server.count(host, "not_found")
+            return self._send(*_json({"error": f"no stub for {host}{path}"}, 404))
+        if not profile.take_token():
+            self.server.count(host, "rate_limited")
+            retry_after = max(1, math.ceil(1 / profile.rate_limit))
+            return self._send(*_json({"error": "rate limit exceeded"}, 429), headers={"Retry-After": str(retry_after)})
+        if fail:
+            self.server.count(host, "errors")
+            return self._send(*_json({"error": "injected failure"}, profile.error_status))
+        self.server.count(host, "ok")
+        self._send(*handler(path, request))
+
+    def _send(self, status: int, content_type: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up first (a tool deadline cancelled the request); nothing left to answer
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """Start the stub on a background thread; ``server.url`` is what ``TRIP_PLANNER_STUB_URL`` should be."""
+    server = StubServer((host, port), config or StubConfig())
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0", help="default latency distribution, e.g. lognormal:80:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests/second per upstream before 429s")
+    parser.add_argument("--config", help="JSON file with 'default' and per-host 'hosts' profiles")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = StubConfig.from_dict(json.load(f), seed=args.seed)
+    else:
+        config = StubConfig(UpstreamProfile(args.latency, args.error_rate, args.error_status, args.rate_limit),
+                            seed=args.seed)
+    server = StubServer((args.host, args.port), config)
+    print(f"Stub APIs listening on {server.url} (set TRIP_PLANNER_STUB_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
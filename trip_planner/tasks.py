@@ -45,7 +45,7 @@ class TravelTasks:
                 For each city, provide:
                 1. Match score based on interests
                 2. Estimated costs
-                3. Weather during travel dates
+                3. Weather during travel dates (one forecast call per city using start_date and end_date)
                 4. Local events during the stay
                 5. Safety considerations
                 6. Transportation options from origin
@@ -124,6 +124,25 @@ class TravelTasks:
                 10. Special requirements options
             """)
 
+    def plan_dining(self, agent, cities: List[str], date_range: Dict[str, str],
+                    interests: List[str], budget: Optional[float] = None) -> str:
+        return dedent(f"""
+                Plan where and what to eat during the trip:
+                - Cities: {', '.join(cities)}
+                - Date range: {date_range['start']} to {date_range['end']}
+                - Interests: {', '.join(interests)}
+                - Budget: ${budget if budget else 'Not specified'}
+
+                For each city, provide:
+                1. Restaurant recommendations for breakfast, lunch and dinner
+                2. Local specialties to try
+                3. Street food and markets
+                4. Price ranges per meal
+                5. Dietary restriction options
+                6. Reservation tips
+                7. Food tours or cooking classes
+            """)
+
     def create_budget(self, agent, cities: List[str], date_range: Dict[str, str],
                      interests: List[str], budget: Optional[float] = None) -> str:
         return dedent(f"""
@@ -1,6 +1,7 @@
 import os
 import logging
-from opentelemetry import trace
+from opentelemetry import metrics, trace
+from opentelemetry.metrics import Observation
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import ConsoleSpanExporter
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
@@ -25,3 +26,217 @@ def setup_telemetry():
     except Exception as e:
         print(f"Failed to setup telemetry: {str(e)}")
         return None 
+
+
+_cache_stats = {}
+_cache_gauges_registered = False
+
+
+def _observe_cache_hit_ratio(options):
+    for name, stats in list(_cache_stats.items()):
+        yield Observation(stats().get("hit_ratio", 0.0), {"cache": name})
+
+
+def _observe_cache_lookups(options):
+    for name, stats in list(_cache_stats.items()):
+        snapshot = stats()
+        yield Observation(snapshot.get("memory_hits", 0) + snapshot.get("disk_hits", 0), {"cache": name, "result": "hit"})
+        yield Observation(snapshot.get("misses", 0), {"cache": name, "result": "miss"})
+
+
+def register_cache_metrics(name, stats):
+    """Export a cache's hit ratio and lookup counts as OpenTelemetry metrics.
+
+    ``stats`` is a callable returning a dict shaped like ``TieredCache.stats()``;
+    it is polled whenever the configured metric reader collects.
+    """
+    global _cache_gauges_registered
+    _cache_stats[name] = stats
+    if _cache_gauges_registered:
+        return
+    try:
+        meter = metrics.get_meter("trip_planner")
+        meter.create_observable_gauge(
+            "trip_planner.cache.hit_ratio",
+            callbacks=[_observe_cache_hit_ratio],
+            description="Fraction of cache lookups served from memory or disk",
+        )
+        meter.create_observable_counter(
+            "trip_planner.cache.lookups",
+            callbacks=[_observe_cache_lookups],
+            description="Cache lookups by result",
+        )
+        _cache_gauges_registered = True
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to register cache metrics: %s", e)
+
+
+_circuit_states = None
+
+# Numeric encoding for the circuit state gauge
+_CIRCUIT_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def _observe_circuit_state(options):
+    for host, breaker in (_circuit_states() if _circuit_states else {}).items():
+        yield Observation(_CIRCUIT_STATE_VALUES.get(breaker["state"], 0), {"host": host})
+
+
+def _observe_short_circuited(options):
+    for host, breaker in (_circuit_states() if _circuit_states else {}).items():
+        yield Observation(breaker["short_circuited"], {"host": host})
+
+
+def register_circuit_metrics(states):
+    """Export per-upstream circuit breaker state (0 closed, 1 half-open, 2 open) and short-circuited calls.
+
+    ``states`` is a callable returning ``{host: CircuitBreaker.as_dict()}``.
+    """
+    global _circuit_states
+    first = _circuit_states is None
+    _circuit_states = states
+    if not first:
+        return
+    try:
+        meter = metrics.get_meter("trip_planner")
+        meter.create_observable_gauge(
+            "trip_planner.http.circuit_state",
+            callbacks=[_observe_circuit_state],
+            description="Circuit breaker state per upstream host: 0 closed, 1 half-open, 2 open",
+        )
+        meter.create_observable_counter(
+            "trip_planner.http.short_circuited",
+            callbacks=[_observe_short_circuited],
+            description="Requests answered by an open circuit without contacting the upstream",
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to register circuit breaker metrics: %s", e)
+
+
+_memo_stats = None
+
+
+def _observe_memo_lookups(options):
+    for tool, counts in (_memo_stats() if _memo_stats else {}).items():
+        yield Observation(counts["hits"], {"tool": tool, "result": "hit"})
+        yield Observation(counts["misses"], {"tool": tool, "result": "miss"})
+
+
+def register_memo_metrics(stats):
+    """Export per-crew-run tool memo lookups by tool and result.
+
+    ``stats`` is a callable returning ``{tool_name: {"hits": int, "misses": int}}``
+    accumulated over every run in the process.
+    """
+    global _memo_stats
+    first = _memo_stats is None
+    _memo_stats = stats
+    if not first:
+        return
+    try:
+        meter = metrics.get_meter("trip_planner")
+        meter.create_observable_counter(
+            "trip_planner.tool_memo.lookups",
+            callbacks=[_observe_memo_lookups],
+            description="Tool calls answered from (hit) or added to (miss) the per-crew-run memo",
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to register tool memo metrics: %s", e)
+
+
+_output_stats = None
+
+
+def _observe_output_tokens(options):
+    for tool, counts in (_output_stats() if _output_stats else {}).items():
+        yield Observation(counts["raw_tokens"], {"tool": tool, "stage": "raw"})
+        yield Observation(counts["tokens"], {"tool": tool, "stage": "budgeted"})
+
+
+def register_output_metrics(stats):
+    """Export tool output size in tokens before and after output budgeting, per tool.
+
+    ``stats`` is a callable returning ``{tool_name: {"raw_tokens": int, "tokens": int, ...}}``.
+    """
+    global _output_stats
+    first = _output_stats is None
+    _output_stats = stats
+    if not first:
+        return
+    try:
+        meter = metrics.get_meter("trip_planner")
+        meter.create_observable_counter(
+            "trip_planner.tool_output.tokens",
+            callbacks=[_observe_output_tokens],
+            description="Tokens of tool output before (raw) and after (budgeted) projection and trimming",
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to register tool output metrics: %s", e)
+
+
+_llm_latency = None
+_llm_route_stats = None
+
+
+def record_llm_latency(route, model, seconds, ok=True):
+    """Record one LLM call's duration on the ``trip_planner.llm.latency`` histogram."""
+    global _llm_latency
+    try:
+        if _llm_latency is None:
+            _llm_latency = metrics.get_meter("trip_planner").create_histogram(
+                "trip_planner.llm.latency",
+                unit="s",
+                description="LLM call latency per model route",
+            )
+        _llm_latency.record(seconds, {"route": route, "model": model, "outcome": "ok" if ok else "error"})
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to record LLM latency: %s", e)
+
+
+def _observe_llm_route_calls(options):
+    for route, stats in (_llm_route_stats() if _llm_route_stats else {}).items():
+        yield Observation(stats["calls"], {"route": route, "model": stats["deployment"]})
+
+
+def register_llm_route_metrics(stats):
+    """Export per-route LLM call counts; ``stats`` is a callable like ``LLMRouter.stats``."""
+    global _llm_route_stats
+    first = _llm_route_stats is None
+    _llm_route_stats = stats
+    if not first:
+        return
+    try:
+        meter = metrics.get_meter("trip_planner")
+        meter.create_observable_counter(
+            "trip_planner.llm.calls",
+            callbacks=[_observe_llm_route_calls],
+            description="LLM calls per model route",
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to register LLM route metrics: %s", e)
+
+
+_job_counts = None
+
+
+def _observe_jobs(options):
+    for status, count in (_job_counts() if _job_counts else {}).items():
+        yield Observation(count, {"status": status})
+
+
+def register_job_metrics(counts):
+    """Export the number of agent-run jobs per status; ``counts`` returns ``{status: int}``."""
+    global _job_counts
+    first = _job_counts is None
+    _job_counts = counts
+    if not first:
+        return
+    try:
+        meter = metrics.get_meter("trip_planner")
+        meter.create_observable_gauge(
+            "trip_planner.jobs",
+            callbacks=[_observe_jobs],
+            description="Agent-run jobs in the persistent queue, by status",
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning("Failed to register job metrics: %s", e)
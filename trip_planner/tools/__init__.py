@@ -12,7 +12,9 @@ from .travel_tools import (
     MatchScoreTool,
     GeocodeTool
 )
-from .classify_justify import ClassifyTripTool, JustifyTripTool, ClassifyCityTool, JustifyCityTool
+from .classify_justify import (
+    ClassifyTripTool, JustifyTripTool, ClassifyCityTool, JustifyCityTool, EvaluateCityTool, EvaluateTripTool
+)
 
 __all__ = [
     'CalculatorTool',
@@ -29,6 +31,8 @@ __all__ = [
     'ClassifyTripTool',
     'JustifyTripTool',
     'ClassifyCityTool',
-    'JustifyCityTool'
+    'JustifyCityTool',
+    'EvaluateCityTool',
+    'EvaluateTripTool'
 ]
 
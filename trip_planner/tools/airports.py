@@ -0,0 +1,142 @@
+import bisect
+import csv
+import functools
+import math
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+AIRPORTS_PATH = os.path.join(os.path.dirname(__file__), "data", "airports.csv")
+
+# Grid cell size in degrees for the nearest-airport lookup
+GRID_DEGREES = 2
+# Don't map a city to an airport further away than this
+MAX_NEAREST_KM = 250
+
+
+class Airport(NamedTuple):
+    iata: str
+    city: str
+    country: str
+    lat: float
+    lon: float
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_city(name: str) -> str:
+    """Fold case and accents and drop any ", Country" suffix: "São Paulo, Brazil" -> "sao paulo"."""
+    name = (name or "").split(",")[0]
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"[^\w\s]", " ", name.casefold())
+    return " ".join(name.split())
+
+
+def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+class AirportIndex:
+    """In-memory airport lookups built once from the bundled dataset.
+
+    City names map straight to airports through a dict, a sorted name array
+    serves prefix queries via bisect, and a coarse lat/lon grid answers
+    nearest-airport queries by only scanning neighbouring cells.
+    """
+
+    def __init__(self, airports: List[Airport]):
+        self.airports = airports
+        self._by_code: Dict[str, Airport] = {a.iata: a for a in airports}
+        # Dataset order puts each city's main airport first
+        self._by_city: Dict[str, List[Airport]] = {}
+        for airport in airports:
+            self._by_city.setdefault(normalize_city(airport.city), []).append(airport)
+        self._names = sorted(self._by_city)
+        self._grid: Dict[Tuple[int, int], List[Airport]] = {}
+        for airport in airports:
+            self._grid.setdefault(self._cell(airport.lat, airport.lon), []).append(airport)
+
+    @classmethod
+    def from_csv(cls, path: str = AIRPORTS_PATH) -> "AirportIndex":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [
+                Airport(row["iata"], row["city"], row["country"], float(row["lat"]), float(row["lon"]))
+                for row in csv.DictReader(f)
+            ]
+        return cls(rows)
+
+    @staticmethod
+    def _cell(lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / GRID_DEGREES)), int(math.floor(lon / GRID_DEGREES))
+
+    def by_code(self, code: str) -> Optional[Airport]:
+        return self._by_code.get((code or "").strip().upper())
+
+    def by_city(self, name: str, country: Optional[str] = None) -> Optional[Airport]:
+        """Main airport for a city name, preferring one in ``country`` when names are ambiguous."""
+        candidates = self._by_city.get(normalize_city(name))
+        if not candidates:
+            return None
+        if country:
+            for airport in candidates:
+                if airport.country == country.upper():
+                    return airport
+        return candidates[0]
+
+    def by_prefix(self, prefix: str, limit: int = 5) -> List[Airport]:
+        """Main airports of cities whose normalized name starts with ``prefix``."""
+        prefix = normalize_city(prefix)
+        if not prefix:
+            return []
+        results = []
+        for name in self._names[bisect.bisect_left(self._names, prefix):]:
+            if not name.startswith(prefix) or len(results) >= limit:
+                break
+            results.append(self._by_city[name][0])
+        return results
+
+    def nearest(self, lat: float, lon: float, max_km: float = MAX_NEAREST_KM) -> Optional[Airport]:
+        """Closest airport within ``max_km``, scanning the surrounding grid cells only."""
+        row, col = self._cell(lat, lon)
+        # Enough rings to cover max_km at this latitude (longitude degrees shrink towards the poles)
+        lat_rings = int(max_km / (111.0 * GRID_DEGREES)) + 1
+        lon_rings = int(max_km / (111.0 * GRID_DEGREES * max(math.cos(math.radians(lat)), 0.05))) + 1
+        best, best_km = None, max_km
+        for r in range(row - lat_rings, row + lat_rings + 1):
+            for c in range(col - lon_rings, col + lon_rings + 1):
+                # Wrap around the antimeridian
+                wrapped = (c + 180 // GRID_DEGREES) % (360 // GRID_DEGREES) - 180 // GRID_DEGREES
+                for airport in self._grid.get((r, wrapped), ()):
+                    km = _haversine_km(lat, lon, airport.lat, airport.lon)
+                    if km <= best_km:
+                        best, best_km = airport, km
+        return best
+
+    def resolve(self, name: str, lat: Optional[float] = None, lon: Optional[float] = None,
+                country: Optional[str] = None) -> Optional[str]:
+        """IATA code for a place: an explicit code, a known city name, or the nearest airport."""
+        name = (name or "").strip()
+        if len(name) == 3 and name.isupper() and name in self._by_code:
+            return name
+        airport = self.by_city(name, country)
+        # (0, 0) is what geocode_city returns when it could not find the place
+        if airport is None and lat is not None and lon is not None and (lat, lon) != (0, 0):
+            airport = self.nearest(lat, lon)
+        return airport.iata if airport else None
+
+
+_index: Optional[AirportIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_airport_index() -> AirportIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AirportIndex.from_csv()
+    return _index
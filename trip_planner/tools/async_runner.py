@@ -0,0 +1,33 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The long-lived event loop that backs every synchronous tool call.
+
+    Keeping one loop alive (instead of ``asyncio.run`` per call) lets the
+    async HTTP client keep its connections open between sync calls.
+    """
+    global _loop, _thread
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _thread = threading.Thread(target=loop.run_forever, name="tool-event-loop", daemon=True)
+                _thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared tool loop and block the calling thread for its result."""
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the tool event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.getenv("TRIP_PLANNER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "trip_planner")),
+    "cache.sqlite3",
+)
+
+# Sentinel so cached falsy values ({} / [] / 0) are still hits
+MISSING = object()
+
+
+def normalize_key(text: str) -> str:
+    """Case-fold, NFKC-normalize and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(unicodedata.normalize("NFKC", text or "").split()).casefold()
+
+
+class TTLCache:
+    """Thread-safe in-process LRU with a per-entry time-to-live."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key: str) -> Any:
+        """Like :meth:`get` but without touching hit/miss counters or LRU order."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[1] <= time.time():
+            return MISSING
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+
+class SQLiteCache:
+    """On-disk JSON value store shared across processes, bounded per namespace."""
+
+    def __init__(self, namespace: str, path: str = DEFAULT_CACHE_PATH, max_entries: int = 10000):
+        self.namespace = namespace
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, last_access REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def get_entry(self, key: str) -> Optional[tuple]:
+        """Return ``(value, expires_at)`` for a live entry, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+                return None
+            self._conn.execute(
+                "UPDATE cache SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, expires_at: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at, now),
+            )
+            self._evict(now)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, now))
+        count = self._conn.execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+        if count > self.max_entries:
+            # Drop least recently used rows down to the size bound
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ? ORDER BY last_access LIMIT ?)",
+                (self.namespace, self.namespace, count - self.max_entries),
+            )
+
+
+class TieredCache:
+    """In-process LRU in front of a SQLite tier; disk hits are promoted to memory."""
+
+    def __init__(self, namespace: str, maxsize: int = 1024, ttl: float = 3600,
+                 disk_max_entries: int = 10000, path: Optional[str] = DEFAULT_CACHE_PATH):
+        self.namespace = namespace
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk: Optional[SQLiteCache] = None
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            try:
+                self.disk = SQLiteCache(namespace, path=path, max_entries=disk_max_entries)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Disk cache for %s unavailable, using memory only: %s", namespace, e)
+
+    @property
+    def ttl(self) -> float:
+        return self.memory.ttl
+
+    def get(self, key: str) -> Any:
+        value = self.memory.get(key)
+        if value is not MISSING:
+            return value
+        if self.disk is not None:
+            try:
+                entry = self.disk.get_entry(key)
+            except sqlite3.Error as e:
+                logger.warning("Disk cache read failed for %s: %s", self.namespace, e)
+                entry = None
+            if entry is not None:
+                self.disk_hits += 1
+                self.memory.set(key, entry[0], expires_at=entry[1])
+                return entry[0]
+        self.misses += 1
+        return MISSING
+
+    def peek(self, key: str) -> Any:
+        """Uncounted lookup, e.g. for polling while another process fills the entry."""
+        value = self.memory.peek(key)
+        if value is not MISSING or self.disk is None:
+            return value
+        try:
+            entry = self.disk.get_entry(key)
+        except sqlite3.Error:
+            return MISSING
+        if entry is None:
+            return MISSING
+        self.memory.set(key, entry[0], expires_at=entry[1])
+        return entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self.memory.set(key, value, expires_at=expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, expires_at)
+            except sqlite3.Error as e:
+                logger.warning("Disk cache write failed for %s: %s", self.namespace, e)
+
+    def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        memory_hits = self.memory.hits
+        lookups = memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_size": len(self.memory),
+        }
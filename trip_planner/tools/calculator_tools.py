@@ -1,6 +1,7 @@
 from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from .run_memo import memoized_tool_call
 
 class CalculatorInput(BaseModel):
     """Input schema for CalculatorTool."""
@@ -11,6 +12,7 @@ class CalculatorTool(BaseTool):
     description: str = "Safely evaluate mathematical expressions like '2 + 3 * (4 - 1)'"
     args_schema: Type[BaseModel] = CalculatorInput
 
+    @memoized_tool_call
     def _run(self, expression: str) -> str:
         """Safely evaluate a math expression."""
         try:
@@ -18,3 +20,8 @@ class CalculatorTool(BaseTool):
             return str(result)
         except Exception as e:
             return f"Error calculating expression: {str(e)}"
+
+    @memoized_tool_call
+    async def _arun(self, expression: str) -> str:
+        # Pure computation, nothing to await
+        return self._run(expression)
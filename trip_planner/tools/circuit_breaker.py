@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from typing import Any, Dict
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("TRIP_PLANNER_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("TRIP_PLANNER_BREAKER_RESET_SECONDS", "30"))
+# Statuses that mean "this upstream will not help right now": outages, throttling, missing/invalid keys
+BREAKER_FAILURE_STATUSES = frozenset({401, 403, 429})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to an upstream whose circuit is open."""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"circuit open for {host}; retrying in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def is_failure_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code in BREAKER_FAILURE_STATUSES
+
+
+class CircuitBreaker:
+    """Per-upstream breaker: opens after consecutive failures, then lets one probe through.
+
+    While open every call fails immediately with :class:`CircuitOpenError`, so
+    tools fall back to their defaults without waiting on timeouts. After
+    ``reset_seconds`` the breaker goes half-open and admits a single probe;
+    success closes it, failure re-opens it for another period.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Raise :class:`CircuitOpenError` unless a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == OPEN and now - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.short_circuited += 1
+            raise CircuitOpenError(self.host, max(0.0, self.reset_seconds - (now - self.opened_at)))
+
+    def record(self, failed: bool):
+        with self._lock:
+            self._probing = False
+            if not failed:
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def abandon(self):
+        """The request was cancelled before it finished; free the probe slot without judging the upstream."""
+        with self._lock:
+            self._probing = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class CircuitBreakers:
+    """Lazily created breaker per upstream host."""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_seconds: float = BREAKER_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    host, CircuitBreaker(host, self.failure_threshold, self.reset_seconds)
+                )
+        return breaker
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.host: b.as_dict() for b in breakers}
+
+    def reset(self):
+        with self._lock:
+            self._breakers.clear()
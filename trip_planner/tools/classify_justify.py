@@ -1,56 +1,193 @@
+import json
 import os
+import re
+from typing import Any, Callable, List, Optional, Sequence, Union
 os.environ["AZURE_API_KEY"] = "90858d0b603c4323a2df07d8064dbcf6"
 os.environ["AZURE_API_BASE"] = "https://llm-mlops-openai.openai.azure.com/"
 os.environ["AZURE_API_VERSION"] = "2025-01-01-preview"
 
 from crewai import Agent, Crew,Task
-from langchain_openai import AzureChatOpenAI
 from crewai.tools import BaseTool
+from .run_memo import memoized_tool_call
+from .llm_cache import cached_ainvoke, cached_batch, cached_invoke
+from ..llm_routing import get_router
 
-# Define the AzureChatOpenAI LLM
-llm = AzureChatOpenAI(
-    api_key="90858d0b603c4323a2df07d8064dbcf6",
-    azure_endpoint="https://llm-mlops-openai.openai.azure.com/",
-    api_version="2024-12-01-preview",
-    azure_deployment="gpt-4o-mini",
-    # api_base="https://llm-mlops-openai.openai.azure.com/",    
-    model_name="azure/gpt-4o-mini",
-    # client="AzureOpenAI"
 
+def routed_llm(name: str):
+    """Chat model for a tool or route name, per the LLM routing table (classifiers default to a small, fast model)."""
+    return get_router().chat_model(name)
+
+def classify_city_prompt(recommendation: str) -> str:
+    return f"Classify if the recommended city is a Ideal or Not based on the cost and description: {recommendation}"
+
+
+def justify_city_prompt(recommendation: str, classification: str) -> str:
+    return f"The city was classified as {classification}. Summary: {recommendation}. Explain why."
+
+
+def classify_trip_prompt(summary: str) -> str:
+    return f"Classify the following travel plan as Ideal or Not Ideal: Travel plan::{summary}"
+
+
+def justify_trip_prompt(classification: str, summary: str) -> str:
+    return f"The trip was classified as {classification}. Summary: {summary}. Explain why."
+
+
+EVALUATION_LABELS = ("Ideal", "Not Ideal")
+
+_EVALUATION_FORMAT = (
+    'Respond with only a JSON object: {"label": "Ideal" or "Not Ideal", '
+    '"justification": "two sentences explaining the label"}.'
 )
 
+
+def evaluate_city_prompt(recommendation: str) -> str:
+    return (
+        "Classify if the recommended city is Ideal or Not Ideal based on the cost and description, "
+        f"and explain why. {_EVALUATION_FORMAT} Recommendation: {recommendation}"
+    )
+
+
+def evaluate_trip_prompt(summary: str) -> str:
+    return (
+        "Classify the following travel plan as Ideal or Not Ideal based on the budget, itinerary and "
+        f"recommendations, and explain why. {_EVALUATION_FORMAT} Travel plan::{summary}"
+    )
+
+
+def parse_evaluation(text: str) -> dict:
+    """``{"label", "justification"}`` from a fused evaluation answer, tolerating code fences and prose around the JSON."""
+    text = (text or "").strip()
+    data = None
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            data = None
+    if not isinstance(data, dict):
+        data = {"label": text, "justification": text}
+    label = str(data.get("label", ""))
+    # "Not Ideal" contains "Ideal", so test the negative first
+    label = "Not Ideal" if re.search(r"not\s+ideal", label, re.IGNORECASE) else "Ideal"
+    return {"label": label, "justification": str(data.get("justification", "")).strip()}
+
+
+# Requests in flight at once when classifying many recommendations together
+BATCH_MAX_CONCURRENCY = int(os.getenv("TRIP_PLANNER_LLM_BATCH_CONCURRENCY", "8"))
+
+
+def classify_batch(items: Sequence[str], prompt: Callable[[str], str] = classify_city_prompt,
+                   max_concurrency: int = BATCH_MAX_CONCURRENCY, bypass: bool = False,
+                   model: Optional[Any] = None) -> List[Union[str, Exception]]:
+    """Classify many recommendations (or, with ``classify_trip_prompt``, plans) in one batch.
+
+    Returns one answer per item in input order; an item whose call failed
+    holds the exception instead of failing the whole batch. Cached and
+    repeated items are not sent again.
+    """
+    return cached_batch(model or routed_llm("classifier"), [prompt(item) for item in items], max_concurrency, bypass=bypass)
+
+
+def evaluate_batch(items: Sequence[str], prompt: Callable[[str], str] = evaluate_city_prompt,
+                   max_concurrency: int = BATCH_MAX_CONCURRENCY, bypass: bool = False,
+                   model: Optional[Any] = None) -> List[Union[dict, Exception]]:
+    """Fused classify-and-justify for many items: ``{"label", "justification"}`` or the exception, per item."""
+    answers = cached_batch(model or routed_llm("evaluator"), [prompt(item) for item in items], max_concurrency,
+                           bypass=bypass)
+    return [answer if isinstance(answer, Exception) else parse_evaluation(answer) for answer in answers]
+
+
 class ClassifyCityTool(BaseTool):
     name: str = "classify_city"
     description: str = "Classify the city recommendation as Ideal or Not Ideal"
+    # Ask the model again instead of reusing a cached answer for the same prompt
+    bypass_cache: bool = False
 
+    @memoized_tool_call
     def _run(self, recommendation: str) -> str:
-        return llm.invoke(f"Classify if the recommended city is a Ideal or Not based on the cost and description: {recommendation}")
+        return cached_invoke(routed_llm(self.name), classify_city_prompt(recommendation), bypass=self.bypass_cache)
+
+    @memoized_tool_call
+    async def _arun(self, recommendation: str) -> str:
+        return await cached_ainvoke(routed_llm(self.name), classify_city_prompt(recommendation), bypass=self.bypass_cache)
 
 
 class JustifyCityTool(BaseTool):
     name: str = "justify_city"
     description: str = "Justify why the recommended City is classified as ideal or Not ideal"
+    bypass_cache: bool = False
 
+    @memoized_tool_call
     def _run(self, recommendation: str, classification: str) -> str:
-        return llm.invoke(
-            f"The city was classified as {classification}. Summary: {recommendation}. Explain why."
-        )
+        return cached_invoke(routed_llm(self.name), justify_city_prompt(recommendation, classification), bypass=self.bypass_cache)
+
+    @memoized_tool_call
+    async def _arun(self, recommendation: str, classification: str) -> str:
+        return await cached_ainvoke(routed_llm(self.name), justify_city_prompt(recommendation, classification), bypass=self.bypass_cache)
 
 
 class ClassifyTripTool(BaseTool):
     name: str = "classify_trip"
     description: str = "Classify the travel plan as Ideal or Not Ideal"
+    bypass_cache: bool = False
 
+    @memoized_tool_call
     def _run(self, summary: str) -> str:
-        return llm.invoke(f"Classify the following travel plan as Ideal or Not Ideal: Travel plan::{summary}")
+        return cached_invoke(routed_llm(self.name), classify_trip_prompt(summary), bypass=self.bypass_cache)
+
+    @memoized_tool_call
+    async def _arun(self, summary: str) -> str:
+        return await cached_ainvoke(routed_llm(self.name), classify_trip_prompt(summary), bypass=self.bypass_cache)
 
 
 class JustifyTripTool(BaseTool):
     name: str = "justify_trip"
     description: str = "Justify why the travel plan is classified as Ideal or Not Ideal"
+    bypass_cache: bool = False
 
+    @memoized_tool_call
     def _run(self, classification: str, summary: str) -> str:
-        return llm.invoke(
-            f"The trip was classified as {classification}. Summary: {summary}. Explain why."
-        )
+        return cached_invoke(routed_llm(self.name), justify_trip_prompt(classification, summary), bypass=self.bypass_cache)
+
+    @memoized_tool_call
+    async def _arun(self, classification: str, summary: str) -> str:
+        return await cached_ainvoke(routed_llm(self.name), justify_trip_prompt(classification, summary), bypass=self.bypass_cache)
+
+
+class EvaluateCityTool(BaseTool):
+    name: str = "evaluate_city"
+    description: str = (
+        "Classify the city recommendation as Ideal or Not Ideal and justify it in one step. "
+        'Returns JSON: {"label": "Ideal" | "Not Ideal", "justification": "..."}'
+    )
+    bypass_cache: bool = False
+
+    @memoized_tool_call
+    def _run(self, recommendation: str) -> str:
+        return json.dumps(parse_evaluation(
+            cached_invoke(routed_llm(self.name), evaluate_city_prompt(recommendation), bypass=self.bypass_cache)))
+
+    @memoized_tool_call
+    async def _arun(self, recommendation: str) -> str:
+        return json.dumps(parse_evaluation(
+            await cached_ainvoke(routed_llm(self.name), evaluate_city_prompt(recommendation), bypass=self.bypass_cache)))
+
+
+class EvaluateTripTool(BaseTool):
+    name: str = "evaluate_trip"
+    description: str = (
+        "Classify the travel plan as Ideal or Not Ideal and justify it in one step. "
+        'Returns JSON: {"label": "Ideal" | "Not Ideal", "justification": "..."}'
+    )
+    bypass_cache: bool = False
+
+    @memoized_tool_call
+    def _run(self, summary: str) -> str:
+        return json.dumps(parse_evaluation(
+            cached_invoke(routed_llm(self.name), evaluate_trip_prompt(summary), bypass=self.bypass_cache)))
 
+    @memoized_tool_call
+    async def _arun(self, summary: str) -> str:
+        return json.dumps(parse_evaluation(
+            await cached_ainvoke(routed_llm(self.name), evaluate_trip_prompt(summary), bypass=self.bypass_cache)))
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from . import http_client
+from .cache import DEFAULT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+RATES_BASE = "USD"
+RATES_REFRESH_SECONDS = int(os.getenv("TRIP_PLANNER_RATES_REFRESH_SECONDS", str(24 * 3600)))
+# How long to wait before retrying after a failed refresh
+RATES_RETRY_SECONDS = int(os.getenv("TRIP_PLANNER_RATES_RETRY_SECONDS", "300"))
+# Upper bound on how long another process may hold the refresh lease
+RATES_LEASE_SECONDS = 60
+RATES_POLL_SECONDS = 0.1
+
+# ISO 3166-1 alpha-2 country code -> ISO 4217 currency code
+COUNTRY_CURRENCY: Dict[str, str] = {
+    "AD": "EUR", "AE": "AED", "AF": "AFN", "AG": "XCD", "AI": "XCD", "AL": "ALL", "AM": "AMD",
+    "AO": "AOA", "AR": "ARS", "AS": "USD", "AT": "EUR", "AU": "AUD", "AW": "AWG", "AX": "EUR",
+    "AZ": "AZN", "BA": "BAM", "BB": "BBD", "BD": "BDT", "BE": "EUR", "BF": "XOF", "BG": "BGN",
+    "BH": "BHD", "BI": "BIF", "BJ": "XOF", "BL": "EUR", "BM": "BMD", "BN": "BND", "BO": "BOB",
+    "BQ": "USD", "BR": "BRL", "BS": "BSD", "BT": "BTN", "BW": "BWP", "BY": "BYN", "BZ": "BZD",
+    "CA": "CAD", "CC": "AUD", "CD": "CDF", "CF": "XAF", "CG": "XAF", "CH": "CHF", "CI": "XOF",
+    "CK": "NZD", "CL": "CLP", "CM": "XAF", "CN": "CNY", "CO": "COP", "CR": "CRC", "CU": "CUP",
+    "CV": "CVE", "CW": "ANG", "CX": "AUD", "CY": "EUR", "CZ": "CZK", "DE": "EUR", "DJ": "DJF",
+    "DK": "DKK", "DM": "XCD", "DO": "DOP", "DZ": "DZD", "EC": "USD", "EE": "EUR", "EG": "EGP",
+    "EH": "MAD", "ER": "ERN", "ES": "EUR", "ET": "ETB", "FI": "EUR", "FJ": "FJD", "FK": "FKP",
+    "FM": "USD", "FO": "DKK", "FR": "EUR", "GA": "XAF", "GB": "GBP", "GD": "XCD", "GE": "GEL",
+    "GF": "EUR", "GG": "GBP", "GH": "GHS", "GI": "GIP", "GL": "DKK", "GM": "GMD", "GN": "GNF",
+    "GP": "EUR", "GQ": "XAF", "GR": "EUR", "GT": "GTQ", "GU": "USD", "GW": "XOF", "GY": "GYD",
+    "HK": "HKD", "HN": "HNL", "HR": "EUR", "HT": "HTG", "HU": "HUF", "ID": "IDR", "IE": "EUR",
+    "IL": "ILS", "IM": "GBP", "IN": "INR", "IO": "USD", "IQ": "IQD", "IR": "IRR", "IS": "ISK",
+    "IT": "EUR", "JE": "GBP", "JM": "JMD", "JO": "JOD", "JP": "JPY", "KE": "KES", "KG": "KGS",
+    "KH": "KHR", "KI": "AUD", "KM": "KMF", "KN": "XCD", "KP": "KPW", "KR": "KRW", "KW": "KWD",
+    "KY": "KYD", "KZ": "KZT", "LA": "LAK", "LB": "LBP", "LC": "XCD", "LI": "CHF", "LK": "LKR",
+    "LR": "LRD", "LS": "LSL", "LT": "EUR", "LU": "EUR", "LV": "EUR", "LY": "LYD", "MA": "MAD",
+    "MC": "EUR", "MD": "MDL", "ME": "EUR", "MF": "EUR", "MG": "MGA", "MH": "USD", "MK": "MKD",
+    "ML": "XOF", "MM": "MMK", "MN": "MNT", "MO": "MOP", "MP": "USD", "MQ": "EUR", "MR": "MRU",
+    "MS": "XCD", "MT": "EUR", "MU": "MUR", "MV": "MVR", "MW": "MWK", "MX": "MXN", "MY": "MYR",
+    "MZ": "MZN", "NA": "NAD", "NC": "XPF", "NE": "XOF", "NF": "AUD", "NG": "NGN", "NI": "NIO",
+    "NL": "EUR", "NO": "NOK", "NP": "NPR", "NR": "AUD", "NU": "NZD", "NZ": "NZD", "OM": "OMR",
+    "PA": "PAB", "PE": "PEN", "PF": "XPF", "PG": "PGK", "PH": "PHP", "PK": "PKR", "PL": "PLN",
+    "PM": "EUR", "PN": "NZD", "PR": "USD", "PS": "ILS", "PT": "EUR", "PW": "USD", "PY": "PYG",
+    "QA": "QAR", "RE": "EUR", "RO": "RON", "RS": "RSD", "RU": "RUB", "RW": "RWF", "SA": "SAR",
+    "SB": "SBD", "SC": "SCR", "SD": "SDG", "SE": "SEK", "SG": "SGD", "SH": "SHP", "SI": "EUR",
+    "SJ": "NOK", "SK": "EUR", "SL": "SLE", "SM": "EUR", "SN": "XOF", "SO": "SOS", "SR": "SRD",
+    "SS": "SSP", "ST": "STN", "SV": "USD", "SX": "ANG", "SY": "SYP", "SZ": "SZL", "TC": "USD",
+    "TD": "XAF", "TG": "XOF", "TH": "THB", "TJ": "TJS", "TK": "NZD", "TL": "USD", "TM": "TMT",
+    "TN": "TND", "TO": "TOP", "TR": "TRY", "TT": "TTD", "TV": "AUD", "TW": "TWD", "TZ": "TZS",
+    "UA": "UAH", "UG": "UGX", "UM": "USD", "US": "USD", "UY": "UYU", "UZ": "UZS", "VA": "EUR",
+    "VC": "XCD", "VE": "VES", "VG": "USD", "VI": "USD", "VN": "VND", "VU": "VUV", "WF": "XPF",
+    "WS": "WST", "XK": "EUR", "YE": "YER", "YT": "EUR", "ZA": "ZAR", "ZM": "ZMW", "ZW": "ZWL",
+}
+
+
+def currency_for_country(country: str, default: str = RATES_BASE) -> str:
+    """Look up a country's currency from the bundled table; no network involved."""
+    return COUNTRY_CURRENCY.get((country or "").strip().upper(), default)
+
+
+class RatesSnapshot:
+    """Exchange-rate table refreshed once per period and shared through SQLite.
+
+    Every process reads the same row, so only one of them refreshes it per
+    period. A stale snapshot keeps being served while a background thread
+    fetches the next one; the only blocking fetch is the very first one on a
+    machine that has never stored rates. A process starting cold while
+    another one holds the refresh lease waits for that snapshot instead.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, base: str = RATES_BASE,
+                 refresh_seconds: int = RATES_REFRESH_SECONDS):
+        self.path = path
+        self.base = base
+        self.refresh_seconds = refresh_seconds
+        self._rates: Dict[str, float] = {}
+        self._fetched_at = 0.0
+        self._checked_at = 0.0
+        self._next_attempt = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        # Serializes cold-start fetches so concurrent first callers wait for one fetch instead of failing
+        self._cold_start_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rates_snapshot ("
+            " base TEXT PRIMARY KEY, rates TEXT NOT NULL, fetched_at REAL NOT NULL,"
+            " lease_until REAL NOT NULL DEFAULT 0)"
+        )
+
+    @property
+    def loaded(self) -> bool:
+        """True once a snapshot is in memory, i.e. :meth:`rates` will not block on the network."""
+        return bool(self._rates)
+
+    def rate(self, currency: str) -> float:
+        """Rate from the base currency to ``currency``; 1.0 when unknown."""
+        return self.rates().get(currency, 1.0)
+
+    def rates(self) -> Dict[str, float]:
+        """The current table; once :attr:`loaded` this never touches SQLite or the network."""
+        if self._rates:
+            now = time.time()
+            # Stale: at most once a minute, a background thread re-reads the shared row (another
+            # process may have refreshed it) and fetches only if it is still stale
+            if now - self._fetched_at >= self.refresh_seconds and now - self._checked_at > 60:
+                self._refresh_in_background()
+            return self._rates
+        with self._cold_start_lock:
+            if not self._rates:
+                self._load()
+            if not self._rates and not self.refresh():
+                self._wait_for_shared_refresh()
+        return self._rates
+
+    def refresh(self) -> bool:
+        """Fetch a new snapshot now, unless another process holds the refresh lease."""
+        now = time.time()
+        if now < self._next_attempt or not self._acquire_lease(now):
+            return False
+        try:
+            api_key = os.getenv('CURRENCY_API_KEY')
+            url = f'https://v6.exchangerate-api.com/v6/{api_key}/latest/{self.base}'
+            rates = http_client.get(url).json().get('conversion_rates') or {}
+            if not rates:
+                raise ValueError("exchange-rate response had no conversion_rates")
+        except Exception as e:
+            logger.warning("Exchange-rate refresh failed: %s", e)
+            self._next_attempt = now + RATES_RETRY_SECONDS
+            self._release_lease()
+            return False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rates_snapshot (base, rates, fetched_at, lease_until) VALUES (?, ?, ?, 0)",
+                (self.base, json.dumps(rates), now),
+            )
+            self._rates, self._fetched_at, self._checked_at = rates, now, now
+        return True
+
+    def _wait_for_shared_refresh(self):
+        # Poll the shared row while another process holds the lease, until it stores rates or the lease lapses
+        while True:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT fetched_at, lease_until FROM rates_snapshot WHERE base = ?", (self.base,)
+                ).fetchone()
+            if row is None or row[0] > self._fetched_at or row[1] < time.time():
+                break
+            time.sleep(RATES_POLL_SECONDS)
+        self._load()
+        if not self._rates:
+            # The holder failed or died without storing a snapshot; try once ourselves
+            self.refresh()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self._load()
+                if time.time() - self._fetched_at >= self.refresh_seconds:
+                    self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="rates-refresh", daemon=True).start()
+
+    def _load(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rates, fetched_at FROM rates_snapshot WHERE base = ?", (self.base,)
+            ).fetchone()
+            self._checked_at = time.time()
+            if row is not None and row[1] > self._fetched_at:
+                self._rates, self._fetched_at = json.loads(row[0]), row[1]
+
+    def _acquire_lease(self, now: float) -> bool:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO rates_snapshot (base, rates, fetched_at, lease_until) VALUES (?, '{}', 0, 0)",
+                (self.base,),
+            )
+            cursor = self._conn.execute(
+                "UPDATE rates_snapshot SET lease_until = ? WHERE base = ? AND lease_until < ?",
+                (now + RATES_LEASE_SECONDS, self.base, now),
+            )
+            return cursor.rowcount == 1
+
+    def _release_lease(self):
+        with self._lock:
+            self._conn.execute("UPDATE rates_snapshot SET lease_until = 0 WHERE base = ?", (self.base,))
+
+
+_snapshot: Optional[RatesSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_rates_snapshot() -> RatesSnapshot:
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = RatesSnapshot()
+    return _snapshot
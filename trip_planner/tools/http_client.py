@@ -0,0 +1,262 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from .circuit_breaker import CircuitBreakers, CircuitOpenError, is_failure_status  # noqa: F401 (re-exported)
+from ..telemetry import register_circuit_metrics
+
+# Defaults can be tuned per deployment without touching code
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv("TRIP_PLANNER_HTTP_CONNECT_TIMEOUT", "3.05"))
+DEFAULT_READ_TIMEOUT = float(os.getenv("TRIP_PLANNER_HTTP_READ_TIMEOUT", "10"))
+DEFAULT_POOL_CONNECTIONS = int(os.getenv("TRIP_PLANNER_HTTP_POOL_CONNECTIONS", "16"))
+DEFAULT_POOL_MAXSIZE = int(os.getenv("TRIP_PLANNER_HTTP_POOL_MAXSIZE", "32"))
+# Base URL of trip_planner.stub_server; when set, every upstream request is sent there instead
+STUB_URL = os.getenv("TRIP_PLANNER_STUB_URL") or None
+
+
+class HostStats:
+    """Running request counters for a single upstream host."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, elapsed: float, failed: bool):
+        self.requests += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if failed:
+            self.errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(1000 * self.total_seconds / self.requests, 2) if self.requests else 0.0,
+            "max_ms": round(1000 * self.max_seconds, 2),
+        }
+
+
+class HTTPClient:
+    """Keep-alive HTTP client with one connection pool per upstream host.
+
+    A single ``requests.Session`` is shared by synchronous callers so TCP/TLS
+    connections are reused across calls instead of being opened per request.
+    Async callers get an ``httpx.AsyncClient`` per event loop with the same
+    timeouts and pool sizes, and both paths feed the same per-host stats and
+    circuit breakers.
+    """
+
+    def __init__(self,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 timeout: Tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                 stub_url: Optional[str] = STUB_URL):
+        self.timeout = timeout
+        self.stub_url = stub_url.rstrip("/") if stub_url else None
+        self.session = requests.Session()
+        # pool_connections = number of host pools kept, pool_maxsize = sockets per host
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._stats: Dict[str, HostStats] = {}
+        # Sockets the async clients opened per upstream host (urllib3 keeps its own count for the session)
+        self._async_connections: Dict[str, int] = {}
+        self.breakers = CircuitBreakers()
+        self._lock = threading.Lock()
+        # One AsyncClient per (event loop, verify) pair; clients cannot be shared across loops
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session, applying the default timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        breaker = self.breakers.get(host)
+        breaker.before_request()
+        start = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(method, self._target(url), **kwargs)
+            failed = is_failure_status(response.status_code)
+            return response
+        finally:
+            breaker.record(failed)
+            self._record(host, time.perf_counter() - start, failed)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def async_client(self, verify: bool = True) -> httpx.AsyncClient:
+        """The AsyncClient bound to the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            if verify not in clients:
+                clients[verify] = httpx.AsyncClient(
+                    verify=verify,
+                    timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                    limits=httpx.Limits(max_connections=self.pool_connections * self.pool_maxsize,
+                                        max_keepalive_connections=self.pool_maxsize),
+                )
+            return clients[verify]
+
+    async def arequest(self, method: str, url: str, verify: bool = True, **kwargs) -> httpx.Response:
+        """Async counterpart of :meth:`request`; accepts ``params``, ``headers`` and ``timeout``."""
+        if kwargs.get("params"):
+            # requests silently drops None-valued params; keep that behaviour
+            kwargs["params"] = {k: v for k, v in kwargs["params"].items() if v is not None}
+        host = urlsplit(url).netloc
+        breaker = self.breakers.get(host)
+        breaker.before_request()
+        start = time.perf_counter()
+        failed = True
+        try:
+            extensions = dict(kwargs.pop("extensions", None) or {})
+            extensions.setdefault("trace", self._connection_tracer(host))
+            response = await self.async_client(verify).request(method, self._target(url),
+                                                               extensions=extensions, **kwargs)
+            failed = is_failure_status(response.status_code)
+            return response
+        except asyncio.CancelledError:
+            breaker.abandon()
+            failed = None
+            raise
+        finally:
+            if failed is not None:
+                breaker.record(failed)
+            self._record(host, time.perf_counter() - start, bool(failed))
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("GET", url, **kwargs)
+
+    def _target(self, url: str) -> str:
+        """``url`` itself, or its stub-server equivalent ``<stub>/<host>/<path>?<query>``."""
+        if not self.stub_url:
+            return url
+        parts = urlsplit(url)
+        return f"{self.stub_url}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+    def _connection_tracer(self, host: str):
+        # httpcore reports each new socket as a connect_tcp event; reused keep-alive connections emit none
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.complete":
+                with self._lock:
+                    self._async_connections[host] = self._async_connections.get(host, 0) + 1
+        return trace
+
+    def _record(self, host: str, elapsed: float, failed: bool):
+        with self._lock:
+            self._stats.setdefault(host, HostStats()).record(elapsed, failed)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request stats, including sockets opened and circuit breaker state."""
+        with self._lock:
+            result = {host: stats.as_dict() for host, stats in self._stats.items()}
+        breakers = self.breakers.states()
+        for host, entry in result.items():
+            entry["connections_opened"] = self._connections_opened(host)
+            entry["circuit"] = breakers.get(host)
+        return result
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+            self._async_connections.clear()
+        self.breakers.reset()
+
+    def close(self):
+        """Close the session and every per-loop AsyncClient, each on the loop that owns it."""
+        self.session.close()
+        with self._lock:
+            owned = [(loop, client) for loop, clients in self._async_clients.items() for client in clients.values()]
+            self._async_clients.clear()
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for loop, client in owned:
+            if loop.is_closed():
+                # Its sockets went with the loop
+                continue
+            if loop is current:
+                # Can't block the loop we are running on; close once control returns to it
+                loop.create_task(client.aclose())
+            elif loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+                except Exception:
+                    pass
+            else:
+                loop.run_until_complete(client.aclose())
+
+    def _connections_opened(self, host: str) -> Optional[int]:
+        # urllib3 keeps one pool per (scheme, host, port); sum across schemes, then add the async sockets
+        with self._lock:
+            total = self._async_connections.get(host)
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            pool_host = f"{key.key_host}:{key.key_port}" if key.key_port else key.key_host
+            if host in (key.key_host, pool_host):
+                total = (total or 0) + pool.num_connections
+        return total
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
+
+
+def configure(**kwargs) -> HTTPClient:
+    """Replace the process-wide client, e.g. to change pool sizes or timeouts; the old one's pools are closed."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HTTPClient(**kwargs)
+    return _client
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Drop-in replacement for ``requests.get`` that uses the shared pools."""
+    return get_client().get(url, **kwargs)
+
+
+async def aget(url: str, **kwargs) -> httpx.Response:
+    """Async GET through the shared per-loop pools."""
+    return await get_client().aget(url, **kwargs)
+
+
+def host_stats() -> Dict[str, Dict[str, Any]]:
+    return get_client().stats()
+
+
+def circuit_states() -> Dict[str, Dict[str, Any]]:
+    """Breaker state per upstream host, e.g. ``{"api.weatherapi.com": {"state": "open", ...}}``."""
+    return get_client().breakers.states()
+
+
+register_circuit_metrics(circuit_states)
@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from opentelemetry import trace
+
+from .cache import MISSING, TieredCache
+from ..telemetry import register_cache_metrics
+
+LLM_CACHE_TTL = int(os.getenv("TRIP_PLANNER_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+# Skip lookups everywhere (answers are still stored), e.g. while iterating on prompts
+LLM_CACHE_BYPASS = os.getenv("TRIP_PLANNER_LLM_CACHE_BYPASS", "0") in ("1", "true", "True")
+
+# Sampling settings that change what the model returns for a prompt
+_PARAM_NAMES = ("temperature", "max_tokens", "top_p", "seed", "stop", "frequency_penalty", "presence_penalty", "n")
+
+_llm_cache = TieredCache("llm", maxsize=512, ttl=LLM_CACHE_TTL)
+register_cache_metrics("llm", _llm_cache.stats)
+
+
+def llm_params(llm: Any) -> Dict[str, Any]:
+    """Model identity and sampling parameters of a LangChain chat model, for cache keys."""
+    params = {name: getattr(llm, name, None) for name in _PARAM_NAMES}
+    params["model"] = getattr(llm, "deployment_name", None) or getattr(llm, "model_name", None) or type(llm).__name__
+    params["model_kwargs"] = getattr(llm, "model_kwargs", None) or None
+    return {name: value for name, value in params.items() if value is not None}
+
+
+def llm_cache_key(llm: Any, prompt: str) -> str:
+    """sha256 over the model, its parameters and the exact prompt text."""
+    material = json.dumps({"params": llm_params(llm), "prompt": prompt}, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _content(message: Any) -> str:
+    return message.content if hasattr(message, "content") else str(message)
+
+
+def _lookup(llm: Any, prompt: str, bypass: bool):
+    key = llm_cache_key(llm, prompt)
+    cached = MISSING if bypass or LLM_CACHE_BYPASS else _llm_cache.get(key)
+    trace.get_current_span().set_attribute("llm.cache_hit", cached is not MISSING)
+    return key, cached
+
+
+def cached_invoke(llm: Any, prompt: str, bypass: bool = False, ttl: Optional[float] = None) -> str:
+    """Text of ``llm.invoke(prompt)``, answered from the LLM cache when the same model saw the same prompt.
+
+    ``bypass`` forces a fresh call and overwrites the stored answer.
+    """
+    key, cached = _lookup(llm, prompt, bypass)
+    if cached is not MISSING:
+        return cached
+    text = _content(llm.invoke(prompt))
+    _llm_cache.set(key, text, ttl=ttl)
+    return text
+
+
+async def cached_ainvoke(llm: Any, prompt: str, bypass: bool = False, ttl: Optional[float] = None) -> str:
+    """Async counterpart of :func:`cached_invoke`."""
+    key, cached = _lookup(llm, prompt, bypass)
+    if cached is not MISSING:
+        return cached
+    text = _content(await llm.ainvoke(prompt))
+    _llm_cache.set(key, text, ttl=ttl)
+    return text
+
+
+def cached_batch(llm: Any, prompts: Sequence[str], max_concurrency: int, bypass: bool = False,
+                 ttl: Optional[float] = None) -> List[Union[str, Exception]]:
+    """Text for each prompt, in input order, sending only uncached, distinct prompts through ``llm.batch``.
+
+    At most ``max_concurrency`` requests are in flight. A failed prompt
+    yields its exception in its slot; the rest of the batch still completes.
+    """
+    results: List[Union[str, Exception, None]] = [None] * len(prompts)
+    pending: Dict[str, List[int]] = {}
+    pending_prompts: List[str] = []
+    for index, prompt in enumerate(prompts):
+        key = llm_cache_key(llm, prompt)
+        if key in pending:
+            pending[key].append(index)
+            continue
+        cached = MISSING if bypass or LLM_CACHE_BYPASS else _llm_cache.get(key)
+        if cached is not MISSING:
+            results[index] = cached
+            continue
+        pending[key] = [index]
+        pending_prompts.append(prompt)
+    span = trace.get_current_span()
+    span.set_attribute("llm.batch_size", len(prompts))
+    span.set_attribute("llm.batch_sent", len(pending_prompts))
+    if pending_prompts:
+        outputs = llm.batch(pending_prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        for (key, indexes), output in zip(pending.items(), outputs):
+            if not isinstance(output, Exception):
+                output = _content(output)
+                _llm_cache.set(key, output, ttl=ttl)
+            for index in indexes:
+                results[index] = output
+    return results
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    return _llm_cache.stats()
@@ -0,0 +1,113 @@
+from typing import Any, Dict, List, NamedTuple, Sequence, Union
+
+import numpy as np
+
+PREFERENCE_KEYWORDS: Dict[str, List[str]] = {
+    "Beach": ["coastal", "beach", "seaside", "ocean"],
+    "Mountains": ["mountain", "hiking", "skiing", "alpine"],
+    "City Life": ["urban", "metropolitan", "city", "downtown"],
+    "Culture": ["museum", "art", "history", "cultural", "heritage"],
+    "Food": ["cuisine", "restaurant", "gastronomy", "culinary"],
+    "Adventure": ["adventure", "outdoor", "sports", "activities"],
+    "Relaxation": ["spa", "wellness", "peaceful", "tranquil"],
+    "Nightlife": ["nightlife", "entertainment", "bars", "clubs"]
+}
+
+SEASON_KEYWORDS: Dict[str, List[str]] = {
+    "Spring": ["mild", "spring", "pleasant", "temperate"],
+    "Summer": ["hot", "summer", "warm", "sunny"],
+    "Fall": ["autumn", "fall", "cool", "mild"],
+    "Winter": ["cold", "winter", "snow", "chilly"]
+}
+
+KEYWORD_POINTS = 0.1
+BUDGET_POINTS = 0.3
+
+
+class MatchProfile(NamedTuple):
+    """One set of traveller constraints to score cities against."""
+    preferences: List[str]
+    budget: float
+    season: str
+
+
+class KeywordMatcher:
+    """Tests every keyword against a batch of texts with one vectorized search per keyword.
+
+    The texts become a single NumPy string array and ``np.char.find`` scans
+    all of them for a keyword in C, so the Python work is per keyword rather
+    than per text or per occurrence. The result is the same as evaluating
+    ``keyword in text`` for every pair.
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = sorted(set(keywords), key=lambda k: (-len(k), k))
+        self.index = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+    def match_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Boolean ``(len(texts), len(keywords))`` matrix of keyword presence."""
+        matches = np.zeros((len(texts), len(self.keywords)), dtype=bool)
+        if not texts:
+            return matches
+        corpus = np.array(texts, dtype=np.str_)
+        for col, keyword in enumerate(self.keywords):
+            matches[:, col] = np.char.find(corpus, keyword) >= 0
+        return matches
+
+
+_matcher = KeywordMatcher(
+    [k for words in PREFERENCE_KEYWORDS.values() for k in words]
+    + [k for words in SEASON_KEYWORDS.values() for k in words]
+)
+
+
+def _as_profile(profile: Union[MatchProfile, Dict[str, Any]]) -> MatchProfile:
+    if isinstance(profile, MatchProfile):
+        return profile
+    return MatchProfile(profile["preferences"], profile["budget"], profile["season"])
+
+
+def _repeated_additions(start: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # Add KEYWORD_POINTS one step at a time so floating-point rounding matches
+    # the scalar "score += 0.1" loop exactly instead of using counts * 0.1
+    score = start
+    for step in range(int(counts.max(initial=0))):
+        score = np.where(counts > step, score + KEYWORD_POINTS, score)
+    return score
+
+
+def score_cities(cities: Sequence[Dict[str, Any]],
+                 profiles: Sequence[Union[MatchProfile, Dict[str, Any]]]) -> np.ndarray:
+    """Score N cities against M profiles in one pass; returns an ``(N, M)`` array in [0, 1].
+
+    Each cell equals what the original per-city scoring loop produces for that
+    city and profile.
+    """
+    profiles = [_as_profile(p) for p in profiles]
+    matches = _matcher.match_matrix([city.get("description", "").lower() for city in cities]).astype(np.int64)
+
+    # Keyword weight columns, one per profile (duplicate preferences count twice, as before)
+    preference_weights = np.zeros((len(_matcher.keywords), len(profiles)), dtype=np.int64)
+    season_weights = np.zeros_like(preference_weights)
+    for col, profile in enumerate(profiles):
+        for pref in profile.preferences:
+            for keyword in PREFERENCE_KEYWORDS.get(pref, ()):
+                preference_weights[_matcher.index[keyword], col] += 1
+        for keyword in SEASON_KEYWORDS.get(profile.season, ()):
+            season_weights[_matcher.index[keyword], col] += 1
+
+    preference_counts = matches @ preference_weights
+    season_counts = matches @ season_weights
+
+    daily_cost = np.array(
+        [city.get("estimated_cost", {}).get("total_per_day", 0) for city in cities], dtype=np.float64
+    )[:, None]
+    budget = np.array([p.budget for p in profiles], dtype=np.float64)[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        over_budget = np.maximum(0, BUDGET_POINTS * (1 - (daily_cost - budget) / budget))
+    budget_term = np.where(daily_cost <= budget, BUDGET_POINTS, over_budget)
+
+    score = _repeated_additions(np.zeros(preference_counts.shape), preference_counts)
+    score = score + budget_term
+    score = _repeated_additions(score, season_counts)
+    return np.clip(score, 0, 1)
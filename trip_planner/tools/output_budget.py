@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from opentelemetry import trace
+
+from ..telemetry import register_output_metrics
+
+logger = logging.getLogger(__name__)
+
+# Used for the token counts when tiktoken or its encoding file is unavailable
+BYTES_PER_TOKEN = 4
+TOKEN_ENCODING = "o200k_base"
+# Records per list serialized to estimate the size of the unbudgeted payload
+RAW_SAMPLE_ITEMS = 8
+
+
+class OutputBudget(NamedTuple):
+    """How much of a tool's result may go back into the agent's prompt."""
+    max_items: int
+    max_bytes: int
+
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    # Loading may download the BPE file; try once per process and fall back to estimates after that
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+                except Exception as e:
+                    logger.info("tiktoken unavailable, estimating tool output tokens from size: %s", e)
+                _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def project(record: Any, fields: Sequence[str]) -> Any:
+    """Copy of ``record`` keeping only the dotted ``fields`` (``"departure.iata"``) that are present."""
+    if not isinstance(record, dict):
+        return record
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        *path, leaf = field.split(".")
+        source = record
+        for part in path:
+            source = source.get(part) if isinstance(source, dict) else None
+        if not isinstance(source, dict) or leaf not in source:
+            continue
+        target = projected
+        for part in path:
+            target = target.setdefault(part, {})
+        target[leaf] = source[leaf]
+    return projected
+
+
+_totals: Dict[str, Dict[str, int]] = {}
+_totals_lock = threading.Lock()
+
+
+def output_stats() -> Dict[str, Dict[str, int]]:
+    """Per-tool call count and token totals before (``raw_tokens``) and after (``tokens``) budgeting."""
+    with _totals_lock:
+        return {tool: dict(counts) for tool, counts in _totals.items()}
+
+
+def _record(tool_name: str, raw_tokens: int, tokens: int):
+    with _totals_lock:
+        counts = _totals.setdefault(tool_name, {"calls": 0, "raw_tokens": 0, "tokens": 0})
+        counts["calls"] += 1
+        counts["raw_tokens"] += raw_tokens
+        counts["tokens"] += tokens
+    span = trace.get_current_span()
+    span.set_attribute("tool_output.raw_tokens", raw_tokens)
+    span.set_attribute("tool_output.tokens", tokens)
+    span.set_attribute("tool_output.tokens_saved", raw_tokens - tokens)
+
+
+def _json_bytes(value: Any) -> int:
+    return len(json.dumps(value).encode("utf-8"))
+
+
+def _estimate_raw_tokens(payload: Dict[str, Any], list_keys: Sequence[str], text: str, tokens: int) -> int:
+    # Serializing and tokenizing a large raw payload would block the caller: size each list from its
+    # first RAW_SAMPLE_ITEMS records, then scale by the bytes per token measured on the fitted text
+    raw_bytes = _json_bytes({key: value for key, value in payload.items() if key not in list_keys})
+    for key in list_keys:
+        items = payload.get(key) or []
+        sample = items[:RAW_SAMPLE_ITEMS]
+        if sample:
+            raw_bytes += round(_json_bytes(sample) * len(items) / len(sample))
+    text_bytes = len(text.encode("utf-8"))
+    if not tokens or not text_bytes:
+        return -(-raw_bytes // BYTES_PER_TOKEN)
+    return max(tokens, round(raw_bytes * tokens / text_bytes))
+
+
+def fit_output(tool_name: str, payload: Dict[str, Any], projections: Dict[str, Sequence[str]],
+               budget: OutputBudget) -> str:
+    """Compact JSON for ``payload`` with each list in ``projections`` projected and trimmed to ``budget``.
+
+    Lists keep their first ``max_items`` records, reduced to the listed
+    fields; if the encoding is still over ``max_bytes`` the longest list
+    gives up records from its tail until it fits. Trimmed lists are reported
+    under ``"truncated"`` so the agent knows more exists. The tokens saved
+    against the unbudgeted ``json.dumps(payload)`` are recorded per tool;
+    only the fitted text, at most ``max_bytes``, is tokenized and the raw
+    size is estimated from a sample of each list, since this runs on the
+    event loop in async tools.
+    """
+    fitted = dict(payload)
+    totals: Dict[str, int] = {}
+    for key, fields in projections.items():
+        items: List[Any] = payload.get(key) or []
+        totals[key] = len(items)
+        fitted[key] = [project(item, fields) for item in items[:budget.max_items]]
+
+    def encode() -> str:
+        truncated = {key: {"shown": len(fitted[key]), "total": total}
+                     for key, total in totals.items() if len(fitted[key]) < total}
+        if truncated:
+            fitted["truncated"] = truncated
+        else:
+            fitted.pop("truncated", None)
+        return compact_json(fitted)
+
+    text = encode()
+    while len(text.encode("utf-8")) > budget.max_bytes:
+        longest: Optional[str] = max(totals, key=lambda k: len(fitted[k]), default=None)
+        if longest is None or not fitted[longest]:
+            break
+        fitted[longest].pop()
+        text = encode()
+
+    tokens = count_tokens(text)
+    _record(tool_name, _estimate_raw_tokens(payload, list(projections), text, tokens), tokens)
+    return text
+
+
+register_output_metrics(output_stats)
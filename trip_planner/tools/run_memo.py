@@ -0,0 +1,183 @@
+import contextvars
+import functools
+import inspect
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .cache import MISSING, normalize_key
+from ..telemetry import register_memo_metrics
+
+
+def canonical_args(value: Any) -> Any:
+    """Tool arguments with strings normalized and mappings sorted, so equivalent calls compare equal."""
+    if isinstance(value, str):
+        return normalize_key(value)
+    if isinstance(value, dict):
+        return {str(k): canonical_args(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonical_args(v) for v in value]
+    return value
+
+
+class RunMemo:
+    """Tool results seen so far in one crew run, keyed by tool name and canonical arguments.
+
+    Agents in the same crew often ask the same question (every specialist
+    gets ``TravelBudgetTool`` and ``SearchInternetTool``); the second ask is
+    answered from here without touching caches, upstreams or quota. Only
+    successful results are kept: exceptions propagate, and tools call
+    :func:`skip_memo` when they answer with a fallback or error, so a later
+    call retries the upstream. The table dies with the run.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tool_name: str, arguments: Dict[str, Any]) -> str:
+        return f"{tool_name}|{json.dumps(canonical_args(arguments), sort_keys=True, default=str)}"
+
+    def get(self, tool_name: str, key: str) -> Any:
+        with self._lock:
+            value = self._results.get(key, MISSING)
+            if value is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+        _record(tool_name, value is not MISSING)
+        return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._results[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+_current: contextvars.ContextVar[Optional[RunMemo]] = contextvars.ContextVar("trip_planner_run_memo", default=None)
+# Key of the memoized call now executing, so ``_arun`` delegating to ``_run`` is one lookup, not two
+_executing: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("trip_planner_run_memo_key", default=None)
+
+# Set while a memoized call executes; skip_memo() flips it to keep that call's result out of the memo
+_skipped: contextvars.ContextVar[Optional[List[bool]]] = contextvars.ContextVar("trip_planner_run_memo_skip", default=None)
+
+# Lifetime hit/miss counts per tool, across all runs in this process
+_totals: Dict[str, Dict[str, int]] = {}
+_totals_lock = threading.Lock()
+
+
+def _record(tool_name: str, hit: bool):
+    with _totals_lock:
+        counts = _totals.setdefault(tool_name, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+
+def memo_stats() -> Dict[str, Dict[str, int]]:
+    with _totals_lock:
+        return {tool: dict(counts) for tool, counts in _totals.items()}
+
+
+def current_memo() -> Optional[RunMemo]:
+    return _current.get()
+
+
+def skip_memo():
+    """Don't memoize the result of the tool call now executing (a fallback or error answer)."""
+    skipped = _skipped.get()
+    if skipped is not None:
+        skipped[0] = True
+
+
+@contextmanager
+def crew_run() -> Iterator[RunMemo]:
+    """Scope a fresh memo table to everything executed inside the block (one ``Crew.kickoff``).
+
+    The table lives in a context variable, so it follows crewAI's async task
+    threads (started with a copied context) and asyncio tasks, and concurrent
+    runs in other requests never see each other's results.
+    """
+    memo = RunMemo()
+    token = _current.set(memo)
+    try:
+        yield memo
+    finally:
+        _current.reset(token)
+        memo.clear()
+
+
+def memoized_tool_call(method: Callable) -> Callable:
+    """Decorate a tool's ``_run``/``_arun`` so repeated calls within a crew run reuse the first result.
+
+    Positional and keyword spellings of the same call, and the sync and async
+    entry points, share one entry. Outside :func:`crew_run` this is a no-op.
+    """
+    signature = inspect.signature(method)
+
+    def lookup(self, args, kwargs):
+        memo = _current.get()
+        if memo is None:
+            return None, None, MISSING
+        try:
+            bound = signature.bind(self, *args, **kwargs)
+        except TypeError:
+            # Let the tool itself report the bad call
+            return None, None, MISSING
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop(next(iter(signature.parameters)), None)
+        key = memo.key(self.name, arguments)
+        if _executing.get() == key:
+            return None, None, MISSING
+        return memo, key, memo.get(self.name, key)
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            memo, key, value = lookup(self, args, kwargs)
+            if value is not MISSING:
+                return value
+            if memo is None:
+                return await method(self, *args, **kwargs)
+            skipped = [False]
+            token, skip_token = _executing.set(key), _skipped.set(skipped)
+            try:
+                result = await method(self, *args, **kwargs)
+            finally:
+                _executing.reset(token)
+                _skipped.reset(skip_token)
+            if not skipped[0]:
+                memo.set(key, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        memo, key, value = lookup(self, args, kwargs)
+        if value is not MISSING:
+            return value
+        if memo is None:
+            return method(self, *args, **kwargs)
+        skipped = [False]
+        token, skip_token = _executing.set(key), _skipped.set(skipped)
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            _executing.reset(token)
+            _skipped.reset(skip_token)
+        if not skipped[0]:
+            memo.set(key, result)
+        return result
+    return wrapper
+
+
+register_memo_metrics(memo_stats)
@@ -0,0 +1,116 @@
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# How much of the page to hand the parser at a time; parsing stops at the first chunk boundary after the last needed result
+CHUNK_SIZE = 8192
+
+
+def decode_result_url(href: str) -> str:
+    """Unwrap DuckDuckGo's ``//duckduckgo.com/l/?uddg=<target>`` redirect links."""
+    if not href:
+        return ""
+    if href.startswith("//"):
+        href = "https:" + href
+    parsed = urlparse(href)
+    if parsed.path == "/l/" and "duckduckgo.com" in parsed.netloc:
+        target = parse_qs(parsed.query).get("uddg")
+        if target:
+            return target[0]
+    return href
+
+
+class ResultParser(HTMLParser):
+    """Streaming extractor for DuckDuckGo HTML results that stops after ``limit`` results.
+
+    Only tracks the handful of classes it needs (``result__title`` /
+    ``result__a`` for the link, ``result__snippet`` for the text) instead of
+    building a tree, and skips sponsored ``result--ad`` blocks.
+    """
+
+    def __init__(self, limit: int = 5):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.results: List[Dict[str, str]] = []
+        self.done = False
+        self._current: Optional[Dict[str, str]] = None
+        self._in_ad = False
+        self._in_title_heading = False
+        # (field, tag, nesting depth) while collecting text for the current result
+        self._capture: Optional[list] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._capture is not None:
+            if tag == self._capture[1]:
+                self._capture[2] += 1
+            return
+        classes = ""
+        href = ""
+        for name, value in attrs:
+            if name == "class":
+                classes = value or ""
+            elif name == "href":
+                href = value or ""
+        if not classes and not (tag == "a" and self._in_title_heading):
+            return
+        class_list = classes.split()
+        if "result" in class_list:
+            self._in_ad = "result--ad" in class_list
+        elif self._in_ad:
+            return
+        elif "result__title" in class_list:
+            self._in_title_heading = True
+        elif tag == "a" and ("result__a" in class_list or self._in_title_heading):
+            self._finish_result()
+            if self.done:
+                return
+            self._current = {"title": "", "url": decode_result_url(href), "snippet": ""}
+            self._start_capture("title", tag)
+        elif "result__snippet" in class_list and self._current is not None:
+            self._start_capture("snippet", tag)
+
+    def handle_endtag(self, tag):
+        if self._capture is not None and tag == self._capture[1]:
+            if self._capture[2]:
+                self._capture[2] -= 1
+                return
+            field = self._capture[0]
+            self._current[field] = " ".join("".join(self._text).split())
+            self._capture = None
+            if field == "snippet":
+                self._finish_result()
+        elif tag == "h2":
+            self._in_title_heading = False
+
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._finish_result()
+
+    def _start_capture(self, field: str, tag: str):
+        self._capture = [field, tag, 0]
+        self._text = []
+
+    def _finish_result(self):
+        if self._current is not None and self._current["title"]:
+            self.results.append(self._current)
+        self._current = None
+        if len(self.results) >= self.limit:
+            self.done = True
+
+
+def parse_results(html: str, limit: int = 5, chunk_size: int = CHUNK_SIZE) -> List[Dict[str, str]]:
+    """First ``limit`` organic results as ``{"title", "url", "snippet"}`` dicts, without parsing the rest of the page."""
+    parser = ResultParser(limit)
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if parser.done:
+            return parser.results
+    parser.close()
+    return parser.results[:limit]
@@ -42,44 +42,123 @@
 ############ Duck Duck Go
 
 
-import requests
-from bs4 import BeautifulSoup
 import json
-from typing import Type
+import os
+from typing import Dict, List, Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
+from opentelemetry import trace
 import urllib3
+from . import http_client
+from .async_runner import run_sync
+from .cache import TieredCache, MISSING, normalize_key
+from .search_parser import parse_results
+from .single_flight import SingleFlight
+from .run_memo import memoized_tool_call, skip_memo
+from ..telemetry import register_cache_metrics
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Search results go stale far faster than geocodes; empty pages (often rate limiting) are retried sooner
+SEARCH_TTL = int(os.getenv("TRIP_PLANNER_SEARCH_TTL", str(6 * 3600)))
+SEARCH_EMPTY_TTL = int(os.getenv("TRIP_PLANNER_SEARCH_EMPTY_TTL", "120"))
+# Opt-in: treat queries with the same words in a different order as the same search. Off by default
+# because word order carries meaning ("flights Madrid to Paris" is not "flights Paris to Madrid")
+SEARCH_SORT_TOKENS = os.getenv("TRIP_PLANNER_SEARCH_SORT_TOKENS", "0") in ("1", "true", "True")
+SEARCH_RESULT_LIMIT = 5
+
+# Entries are {"title", "url", "snippet"} dicts; the namespace changed when they stopped being bare titles,
+# and again when keys stopped being token-sorted by default
+_search_cache = TieredCache("search_results_v2", maxsize=512, ttl=SEARCH_TTL, disk_max_entries=20000)
+# Concurrent identical queries share one request
+_search_flight = SingleFlight("search")
+_search_requests = 0
+
+
+def normalize_query(query: str, sort_tokens: bool = SEARCH_SORT_TOKENS) -> str:
+    """Cache key for a query: case-folded with whitespace collapsed, so "Best  Hotels Lisbon" and
+    "best hotels lisbon" share one. ``sort_tokens`` also ignores word order; repeated words are kept."""
+    key = normalize_key(query)
+    if sort_tokens:
+        key = " ".join(sorted(key.split()))
+    return key
+
+
+def search_cache_stats() -> dict:
+    """Hit/miss counters for the search cache plus upstream and coalesced request counts."""
+    return {**_search_cache.stats(), "upstream_requests": _search_requests, **_search_flight.stats()}
+
+
+register_cache_metrics("search", _search_cache.stats)
+
+
+async def _fetch_results(query: str, key: str) -> List[Dict[str, str]]:
+    global _search_requests
+    headers = {"User-Agent": "Mozilla/5.0"}
+    url = f"https://duckduckgo.com/html/?q={query}"
+    _search_requests += 1
+    response = await http_client.aget(
+        url, headers=headers, verify=False   # ✅ disable SSL verification
+    )
+    results = parse_results(response.text, limit=SEARCH_RESULT_LIMIT)
+    _search_cache.set(key, results, ttl=SEARCH_TTL if results else SEARCH_EMPTY_TTL)
+    return results
+
+
+async def search(query: str) -> List[Dict[str, str]]:
+    """Top results (title, url, snippet) for ``query``, served from cache or a single shared in-flight fetch."""
+    key = normalize_query(query)
+    cached = _search_cache.get(key)
+    trace.get_current_span().set_attribute("search.cache_hit", cached is not MISSING)
+    if cached is not MISSING:
+        return [dict(r) for r in cached]
+    return await _search_uncached(query, key)
+
+
+async def _search_uncached(query: str, key: str) -> List[Dict[str, str]]:
+    results = await _search_flight.do(key, lambda: _fetch_results(query, key),
+                                      check=lambda: _search_cache.peek(key))
+    return [dict(r) for r in results]
+
+
 class SearchInput(BaseModel):
     """Input for search tool."""
     query: str = Field(..., description="The search query")
 
 class SearchInternetTool(BaseTool):
     name: str = "search_internet"
-    description: str = "Search the internet for the given query and return top results."
+    description: str = "Search the internet for the given query and return the top results with their title, URL and snippet."
     args_schema: Type[BaseModel] = SearchInput
 
+    @memoized_tool_call
     def _run(self, query: str) -> str:
-        """Perform the search using DuckDuckGo HTML results."""
+        key = normalize_query(query)
+        results = _search_cache.get(key)
+        trace.get_current_span().set_attribute("search.cache_hit", results is not MISSING)
         try:
-            headers = {"User-Agent": "Mozilla/5.0"}
-            url = f"https://duckduckgo.com/html/?q={query}"
-            response = requests.get(
-                url, headers=headers, timeout=10, verify=False   # ✅ disable SSL verification
-            )
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            results = []
-            for a in soup.select(".result__title a")[:5]:
-                title = a.get_text(strip=True)
-                if title:
-                    results.append(title)
+            if results is MISSING:
+                # Only misses need the event loop
+                results = run_sync(_search_uncached(query, key))
+            if not results:
+                # Usually rate limiting; cached only briefly, so don't pin it for the run
+                skip_memo()
+            return json.dumps(results, ensure_ascii=False)
 
+        except Exception as e:
+            skip_memo()
+            return json.dumps([f"Error during search: {str(e)}"])
+
+    @memoized_tool_call
+    async def _arun(self, query: str) -> str:
+        """Perform the search using DuckDuckGo HTML results."""
+        try:
+            results = await search(query)
+            if not results:
+                skip_memo()
             return json.dumps(results, ensure_ascii=False)
 
         except Exception as e:
+            skip_memo()
             return json.dumps([f"Error during search: {str(e)}"])
 
 # import requests
@@ -0,0 +1,159 @@
+import asyncio
+import concurrent.futures
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .cache import DEFAULT_CACHE_PATH, MISSING
+
+logger = logging.getLogger(__name__)
+
+# Coordinate cold-cache fetches across processes (Streamlit/FastAPI workers) through SQLite
+CROSS_PROCESS = os.getenv("TRIP_PLANNER_SINGLE_FLIGHT_CROSS_PROCESS", "1") not in ("0", "false", "False")
+# Longest another process waits on a lease holder before fetching itself
+LEASE_SECONDS = float(os.getenv("TRIP_PLANNER_SINGLE_FLIGHT_LEASE_SECONDS", "15"))
+POLL_SECONDS = 0.05
+
+
+class SQLiteLease:
+    """Named, expiring leases in the shared cache database; at most one holder per name."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.holder = f"{os.getpid()}:{uuid.uuid4().hex}"
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def acquire(self, name: str, seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at"
+                " WHERE leases.expires_at < ?",
+                (name, self.holder, now + seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, name: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, self.holder))
+
+
+_lease: Optional[SQLiteLease] = None
+_lease_lock = threading.Lock()
+
+
+def get_lease() -> Optional[SQLiteLease]:
+    """Process-wide lease table, or None when the cache database is unavailable."""
+    global _lease
+    if _lease is None:
+        with _lease_lock:
+            if _lease is None:
+                try:
+                    _lease = SQLiteLease()
+                except (sqlite3.Error, OSError) as e:
+                    logger.warning("Cross-process single-flight unavailable: %s", e)
+                    return None
+    return _lease
+
+
+class SingleFlight:
+    """Run one fetch per key at a time; concurrent callers for the same key share its result.
+
+    In-process callers, from any thread or event loop, wait on the leader's
+    future. With ``cross_process`` the leader also takes a SQLite lease, so
+    other processes poll ``check`` (normally a cache peek) for the value
+    instead of fetching it again.
+    """
+
+    def __init__(self, name: str, cross_process: bool = CROSS_PROCESS, lease_seconds: float = LEASE_SECONDS):
+        self.name = name
+        self.cross_process = cross_process
+        self.lease_seconds = lease_seconds
+        self.leaders = 0
+        self.coalesced = 0
+        self.lease_waits = 0
+        self._calls: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: str, fetch: Callable[[], Awaitable[Any]],
+                 check: Optional[Callable[[], Any]] = None) -> Any:
+        """Result of ``fetch()`` for ``key``, running it only if no other caller already is."""
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = concurrent.futures.Future()
+                    self._calls[key] = future
+                    self.leaders += 1
+                else:
+                    self.coalesced += 1
+            if leader:
+                break
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                # The leader was cancelled (not us): take over instead of failing
+                if not future.cancelled():
+                    raise
+
+        try:
+            result = await self._lead(key, fetch, check)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def _lead(self, key: str, fetch: Callable[[], Awaitable[Any]], check: Optional[Callable[[], Any]]) -> Any:
+        lease = get_lease() if self.cross_process and check is not None else None
+        if lease is None:
+            return await fetch()
+        name = f"{self.name}|{key}"
+        try:
+            acquired = lease.acquire(name, self.lease_seconds)
+            if not acquired:
+                # Another process is fetching; its result lands in the shared cache
+                self.lease_waits += 1
+                deadline = time.monotonic() + self.lease_seconds
+                while not acquired and time.monotonic() < deadline:
+                    value = check()
+                    if value is not MISSING:
+                        return value
+                    await asyncio.sleep(POLL_SECONDS)
+                    acquired = lease.acquire(name, self.lease_seconds)
+                # The previous holder may have finished between the last poll and the acquire
+                value = check()
+                if value is not MISSING:
+                    if acquired:
+                        lease.release(name)
+                    return value
+        except sqlite3.Error as e:
+            logger.warning("Single-flight lease for %s failed: %s", self.name, e)
+            acquired = False
+        try:
+            return await fetch()
+        finally:
+            if acquired:
+                lease.release(name)
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "lease_waits": self.lease_waits}
@@ -1,16 +1,28 @@
-from typing import Optional, Dict, Any, List, Type
+from typing import Optional, Dict, Any, List, Type, Union
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
-import requests
 import json
 from datetime import datetime, timedelta
+import asyncio
 import os
+from . import http_client
+from .async_runner import run_sync
+from .cache import TieredCache, MISSING, normalize_key
+from .currency import currency_for_country, get_rates_snapshot
+from .match_scoring import MatchProfile, score_cities
+from .airports import get_airport_index
+from .single_flight import SingleFlight
+from .run_memo import memoized_tool_call, skip_memo
+from .output_budget import OutputBudget, fit_output
+from ..telemetry import register_cache_metrics
 
 # Input schemas for each tool
 class WeatherForecastInput(BaseModel):
     """Input schema for WeatherForecastTool."""
     destination: str = Field(..., description="The destination city for weather forecast")
     date: Optional[str] = Field(None, description="Date for forecast in YYYY-MM-DD format")
+    start_date: Optional[str] = Field(None, description="First day of a trip in YYYY-MM-DD format; returns one forecast per day up to end_date")
+    end_date: Optional[str] = Field(None, description="Last day of a trip in YYYY-MM-DD format (defaults to start_date)")
 
 class LocalEventsInput(BaseModel):
     """Input schema for LocalEventsTool."""
@@ -43,7 +55,7 @@ class AccommodationOptionsInput(BaseModel):
 
 class MatchScoreInput(BaseModel):
     """Input schema for MatchScoreTool."""
-    city: Dict[str, Any] = Field(..., description="City data dictionary")
+    city: Union[Dict[str, Any], List[Dict[str, Any]]] = Field(..., description="City data dictionary, or a list of them to score in one call")
     preferences: List[str] = Field(..., description="User preferences list")
     budget: float = Field(..., description="Daily budget amount")
     season: str = Field(..., description="Travel season")
@@ -52,85 +64,276 @@ class GeocodeInput(BaseModel):
     """Input schema for GeocodeTool."""
     city_name: str = Field(..., description="Name of the city to geocode")
 
-# Helper functions (unchanged)
-def geocode_city(city_name: str) -> dict:
+# Geocodes rarely change; failed lookups are retried after a short window
+GEOCODE_TTL = int(os.getenv("TRIP_PLANNER_GEOCODE_TTL", str(30 * 24 * 3600)))
+GEOCODE_NEGATIVE_TTL = int(os.getenv("TRIP_PLANNER_GEOCODE_NEGATIVE_TTL", "300"))
+_geocode_cache = TieredCache("geocode", maxsize=1024, ttl=GEOCODE_TTL, disk_max_entries=50000)
+_geocode_requests = 0
+_geocode_flight = SingleFlight("geocode")
+
+# Events change daily at most; safety information far less often
+EVENTS_TTL = int(os.getenv("TRIP_PLANNER_EVENTS_TTL", "3600"))
+SAFETY_TTL = int(os.getenv("TRIP_PLANNER_SAFETY_TTL", str(24 * 3600)))
+FALLBACK_TTL = 60
+SAFETY_FALLBACK = {
+    "general_safety": "Generally safe for tourists",
+    "health_concerns": "No major health concerns",
+    "crime_rate": "Low",
+    "natural_disasters": "Low risk"
+}
+EVENTS_FALLBACK_DESCRIPTION = "Annual cultural festival"
+_events_cache = TieredCache("events", maxsize=1024, ttl=EVENTS_TTL, disk_max_entries=20000)
+_safety_cache = TieredCache("safety", maxsize=1024, ttl=SAFETY_TTL, disk_max_entries=20000)
+_events_flight = SingleFlight("events")
+_safety_flight = SingleFlight("safety")
+register_cache_metrics("events", _events_cache.stats)
+register_cache_metrics("safety", _safety_cache.stats)
+
+# Forecasts are shared across agents, tools and Streamlit reruns; near-term ones change fastest
+WEATHER_TODAY_TTL = 3600
+WEATHER_NEAR_TTL = 3 * 3600
+WEATHER_FAR_TTL = 6 * 3600
+WEATHER_PAST_TTL = 7 * 24 * 3600
+WEATHER_NEGATIVE_TTL = 60
+# Answered when the forecast can't be fetched
+WEATHER_FALLBACK = {"temperature": 25, "condition": "Sunny", "humidity": 60, "wind_speed": 10}
+# Furthest ahead forecast.json reaches, and the longest range answered in one call
+WEATHER_FORECAST_DAYS = 14
+WEATHER_MAX_RANGE_DAYS = 31
+_weather_cache = TieredCache("weather", maxsize=2048, ttl=WEATHER_TODAY_TTL, disk_max_entries=20000)
+register_cache_metrics("weather", _weather_cache.stats)
+
+ROUTES_DEADLINE_SECONDS = float(os.getenv("TRIP_PLANNER_ROUTES_DEADLINE_SECONDS", "15"))
+# Upper bound on what one routes answer adds to the agent's prompt
+ROUTES_MAX_ITEMS = int(os.getenv("TRIP_PLANNER_ROUTES_MAX_ITEMS", "8"))
+ROUTES_MAX_BYTES = int(os.getenv("TRIP_PLANNER_ROUTES_MAX_BYTES", "4096"))
+# The fields the transportation agents actually read; everything else in the upstream records is dropped
+FLIGHT_FIELDS = (
+    "flight.iata", "airline.name", "flight_status",
+    "departure.iata", "departure.scheduled", "arrival.iata", "arrival.scheduled",
+)
+TRANSIT_ROUTE_FIELDS = ("route_short_name", "route_long_name", "route_type", "agency.agency_name")
+
+# Helper functions
+async def ageocode_city(city_name: str) -> dict:
     """Get latitude, longitude, and country for a city using OpenTripMap."""
+    key = normalize_key(city_name)
+    cached = _geocode_cache.get(key)
+    if cached is not MISSING:
+        return dict(cached)
+    return dict(await _lookup_geocode(city_name, key))
+
+async def _lookup_geocode(city_name: str, key: str) -> dict:
+    # Concurrent lookups of the same city (any thread, loop or process) share one request
+    return await _geocode_flight.do(key, lambda: _fetch_geocode(city_name, key),
+                                    check=lambda: _geocode_cache.peek(key))
+
+async def _fetch_geocode(city_name: str, key: str) -> dict:
+    global _geocode_requests
     try:
         url = f"https://api.opentripmap.com/0.1/en/places/geoname"
         params = {
             'name': city_name,
             'apikey': os.getenv('OPENTRIPMAP_API_KEY')
         }
-        response = requests.get(url, params=params)
+        _geocode_requests += 1
+        response = await http_client.aget(url, params=params)
         data = response.json()
-        return {
+        if 'lat' not in data or 'lon' not in data:
+            raise ValueError(f"No geocode result for {city_name}")
+        result = {
             'lat': data.get('lat', 0),
             'lon': data.get('lon', 0),
             'country': data.get('country', ''),
             'name': data.get('name', city_name)
         }
+        ttl = GEOCODE_TTL
     except Exception as e:
-        return {'lat': 0, 'lon': 0, 'country': '', 'name': city_name}
+        result = {'lat': 0, 'lon': 0, 'country': '', 'name': city_name}
+        ttl = GEOCODE_NEGATIVE_TTL
+    _geocode_cache.set(key, result, ttl=ttl)
+    return result
+
+def geocode_city(city_name: str) -> dict:
+    """Synchronous :func:`ageocode_city`; cache hits skip the event loop entirely."""
+    key = normalize_key(city_name)
+    cached = _geocode_cache.get(key)
+    if cached is not MISSING:
+        return dict(cached)
+    return dict(run_sync(_lookup_geocode(city_name, key)))
+
+def geocode_cache_stats() -> dict:
+    """Hit/miss counters for the geocode cache plus upstream requests made and calls coalesced."""
+    return {**_geocode_cache.stats(), "upstream_requests": _geocode_requests, **_geocode_flight.stats()}
+
+def _events_key(destination: str, date_range: Optional[Dict[str, str]]) -> str:
+    date_range = date_range or {}
+    return f"{normalize_key(destination)}|{date_range.get('start', '')}|{date_range.get('end', '')}"
+
+def _is_geocode_fallback(geo: dict) -> bool:
+    return not geo.get('country') and geo.get('lat') == 0 and geo.get('lon') == 0
+
+def _is_events_fallback(events: list) -> bool:
+    return len(events) == 1 and events[0].get("description") == EVENTS_FALLBACK_DESCRIPTION
+
+def weather_ttl(date: str) -> int:
+    """How long a forecast for ``date`` stays fresh: an hour for today, longer further out, a week once it's past."""
+    try:
+        days_ahead = (datetime.strptime(date, "%Y-%m-%d").date() - datetime.now().date()).days
+    except (TypeError, ValueError):
+        return WEATHER_TODAY_TTL
+    if days_ahead < 0:
+        return WEATHER_PAST_TTL
+    if days_ahead == 0:
+        return WEATHER_TODAY_TTL
+    return WEATHER_NEAR_TTL if days_ahead <= 2 else WEATHER_FAR_TTL
+
+def weather_cache_key(destination: str, date: str) -> str:
+    """Cache key shared by every spelling of a destination ("  lisbon" / "Lisbon") and date format."""
+    try:
+        date = datetime.strptime(date.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+    except (AttributeError, ValueError):
+        pass
+    return f"{normalize_key(destination)}|{date}"
+
+def _day_cache_key(destination: str, date: str) -> str:
+    # Per-day summaries from range mode; kept apart from single-date answers, which hold current conditions
+    return "day|" + weather_cache_key(destination, date)
+
+def _date_range(start_date: str, end_date: Optional[str]) -> List[str]:
+    """Every date from start to end; ValueError (with a message meant for the agent) on bad input."""
+    try:
+        start = datetime.strptime(start_date.strip(), "%Y-%m-%d").date()
+        end = datetime.strptime(end_date.strip(), "%Y-%m-%d").date() if end_date else start
+    except (AttributeError, ValueError):
+        raise ValueError(f"start_date and end_date must be YYYY-MM-DD, got {start_date!r} and {end_date!r}")
+    if end < start:
+        raise ValueError(f"end_date {end_date} is before start_date {start_date}")
+    days = min((end - start).days + 1, WEATHER_MAX_RANGE_DAYS)
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+
+def _compact_day(forecastday: dict) -> dict:
+    day = forecastday.get('day', {})
+    return {
+        "date": forecastday['date'],
+        "max_temp": day.get('maxtemp_c'),
+        "min_temp": day.get('mintemp_c'),
+        "condition": day.get('condition', {}).get('text'),
+        "chance_of_rain": day.get('daily_chance_of_rain'),
+        "humidity": day.get('avghumidity'),
+        "max_wind_speed": day.get('maxwind_kph')
+    }
+
+def _cached_days(destination: str, dates: List[str]) -> Dict[str, Any]:
+    days = {}
+    for date in dates:
+        cached = _weather_cache.get(_day_cache_key(destination, date))
+        if cached is not MISSING:
+            days[date] = cached
+    return days
+
+def _range_error(destination: str, start_date: Optional[str], end_date: Optional[str], error: str) -> str:
+    # Same fallback forecast as single-date mode, plus what was wrong so the agent can retry
+    return json.dumps({"destination": destination, "start_date": start_date, "end_date": end_date,
+                       **WEATHER_FALLBACK, "error": error})
+
+def _range_result(destination: str, dates: List[str], days: Dict[str, Any]) -> str:
+    return json.dumps({
+        "destination": destination,
+        "start_date": dates[0],
+        "end_date": dates[-1],
+        # Days beyond the forecast horizon (or in the past) have no forecast
+        "days": [days.get(date) or {"date": date, "forecast_available": False} for date in dates]
+    })
+
+def weather_cache_stats() -> dict:
+    """Hit/miss counters for the forecast cache."""
+    return _weather_cache.stats()
 
 def calculate_match_score(city: Dict[str, Any], preferences: List[str], budget: float, season: str) -> float:
     """Calculate how well a city matches the user's preferences."""
-    score = 0.0
-    max_score = 1.0
-    
-    # Preference matching (40% of total score)
-    preference_weights = {
-        "Beach": ["coastal", "beach", "seaside", "ocean"],
-        "Mountains": ["mountain", "hiking", "skiing", "alpine"],
-        "City Life": ["urban", "metropolitan", "city", "downtown"],
-        "Culture": ["museum", "art", "history", "cultural", "heritage"],
-        "Food": ["cuisine", "restaurant", "gastronomy", "culinary"],
-        "Adventure": ["adventure", "outdoor", "sports", "activities"],
-        "Relaxation": ["spa", "wellness", "peaceful", "tranquil"],
-        "Nightlife": ["nightlife", "entertainment", "bars", "clubs"]
-    }
-    
-    description = city.get("description", "").lower()
-    for pref in preferences:
-        if pref in preference_weights:
-            for keyword in preference_weights[pref]:
-                if keyword in description:
-                    score += 0.1  # 0.1 points per matching keyword
-    
-    # Budget matching (30% of total score)
-    daily_cost = city.get("estimated_cost", {}).get("total_per_day", 0)
-    if daily_cost <= budget:
-        score += 0.3  # Full points if within budget
-    else:
-        # Reduce score based on how much over budget
-        budget_diff = (daily_cost - budget) / budget
-        score += max(0, 0.3 * (1 - budget_diff))
-    
-    # Season matching (30% of total score)
-    season_weather = {
-        "Spring": ["mild", "spring", "pleasant", "temperate"],
-        "Summer": ["hot", "summer", "warm", "sunny"],
-        "Fall": ["autumn", "fall", "cool", "mild"],
-        "Winter": ["cold", "winter", "snow", "chilly"]
-    }
-    
-    if season in season_weather:
-        for keyword in season_weather[season]:
-            if keyword in description:
-                score += 0.1  # 0.1 points per matching season keyword
-    
-    # Normalize score to be between 0 and 1
-    return min(max(score, 0), 1)
+    return float(score_cities([city], [MatchProfile(preferences, budget, season)])[0, 0])
 
 # CrewAI Tool Classes
 class WeatherForecastTool(BaseTool):
     name: str = "Weather Forecast Tool"
-    description: str = "Get weather forecast for a destination and date. Provides temperature, conditions, humidity, and wind speed."
+    description: str = "Get weather forecast for a destination and date. Provides temperature, conditions, humidity, and wind speed. Pass start_date and end_date instead of date to get a per-day forecast for a whole trip in one call."
     args_schema: Type[BaseModel] = WeatherForecastInput
 
-    def _run(self, destination: str, date: Optional[str] = None) -> str:
+    @memoized_tool_call
+    def _run(self, destination: str, date: Optional[str] = None,
+             start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
+        if start_date or end_date:
+            try:
+                dates = _date_range(start_date or end_date, end_date)
+            except ValueError as e:
+                skip_memo()
+                return _range_error(destination, start_date, end_date, str(e))
+            days = _cached_days(destination, dates)
+            if len(days) == len(dates):
+                return _range_result(destination, dates, days)
+            return run_sync(self._fetch_range(destination, dates, days))
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
-            
+        cached = _weather_cache.get(weather_cache_key(destination, date))
+        if cached is not MISSING:
+            if cached == WEATHER_FALLBACK:
+                # A recent failure, cached briefly; let the next call in this run try again
+                skip_memo()
+            return json.dumps(cached)
+        return run_sync(self._fetch(destination, date))
+
+    @memoized_tool_call
+    async def _arun(self, destination: str, date: Optional[str] = None,
+                    start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
+        if start_date or end_date:
+            try:
+                dates = _date_range(start_date or end_date, end_date)
+            except ValueError as e:
+                skip_memo()
+                return _range_error(destination, start_date, end_date, str(e))
+            days = _cached_days(destination, dates)
+            if len(days) == len(dates):
+                return _range_result(destination, dates, days)
+            return await self._fetch_range(destination, dates, days)
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d")
+        cached = _weather_cache.get(weather_cache_key(destination, date))
+        if cached is not MISSING:
+            if cached == WEATHER_FALLBACK:
+                # A recent failure, cached briefly; let the next call in this run try again
+                skip_memo()
+            return json.dumps(cached)
+        return await self._fetch(destination, date)
+
+    async def _fetch_range(self, destination: str, dates: List[str], days: Dict[str, Any]) -> str:
+        """One forecast.json request covering every missing day of the range; each day is cached on its own."""
+        today = datetime.now().date()
+        horizon = [d for d in dates if d not in days
+                   and 0 <= (datetime.strptime(d, "%Y-%m-%d").date() - today).days < WEATHER_FORECAST_DAYS]
+        if horizon:
+            try:
+                url = "http://api.weatherapi.com/v1/forecast.json"
+                params = {
+                    'key': os.getenv('WEATHER_API_KEY'),
+                    'q': destination,
+                    'days': (datetime.strptime(horizon[-1], "%Y-%m-%d").date() - today).days + 1,
+                    'aqi': 'no',
+                    'alerts': 'no'
+                }
+                response = await http_client.aget(url, params=params)
+                data = response.json()
+                for forecastday in data['forecast']['forecastday']:
+                    day = _compact_day(forecastday)
+                    _weather_cache.set(_day_cache_key(destination, day['date']), day, ttl=weather_ttl(day['date']))
+                    if day['date'] in dates:
+                        days[day['date']] = day
+            except Exception as e:
+                # Nothing cached, so the next call retries; the circuit breaker bounds how often
+                skip_memo()
+        return _range_result(destination, dates, days)
+
+    async def _fetch(self, destination: str, date: str) -> str:
         try:
             url = "http://api.weatherapi.com/v1/forecast.json"
             params = {
@@ -139,7 +342,7 @@ class WeatherForecastTool(BaseTool):
                 'dt': date,
                 'aqi': 'no'
             }
-            response = requests.get(url, params=params)
+            response = await http_client.aget(url, params=params)
             data = response.json()
             
             result = {
@@ -148,14 +351,13 @@ class WeatherForecastTool(BaseTool):
                 "humidity": data['current']['humidity'],
                 "wind_speed": data['current']['wind_kph']
             }
+            ttl = weather_ttl(date)
         except Exception as e:
-            result = {
-                "temperature": 25,
-                "condition": "Sunny",
-                "humidity": 60,
-                "wind_speed": 10
-            }
+            result = dict(WEATHER_FALLBACK)
+            ttl = WEATHER_NEGATIVE_TTL
+            skip_memo()
         
+        _weather_cache.set(weather_cache_key(destination, date), result, ttl=ttl)
         return json.dumps(result)
 
 class LocalEventsTool(BaseTool):
@@ -163,9 +365,33 @@ class LocalEventsTool(BaseTool):
     description: str = "Get local events for a destination within a date range. Returns event names, dates, venues, and URLs."
     args_schema: Type[BaseModel] = LocalEventsInput
 
+    @memoized_tool_call
     def _run(self, destination: str, date_range: Optional[Dict[str, str]] = None) -> str:
+        key = _events_key(destination, date_range)
+        events = _events_cache.get(key)
+        if events is MISSING:
+            events = run_sync(self._lookup(destination, date_range, key))
+        if _is_events_fallback(events):
+            skip_memo()
+        return json.dumps(events)
+
+    @memoized_tool_call
+    async def _arun(self, destination: str, date_range: Optional[Dict[str, str]] = None) -> str:
+        key = _events_key(destination, date_range)
+        events = _events_cache.get(key)
+        if events is MISSING:
+            events = await self._lookup(destination, date_range, key)
+        if _is_events_fallback(events):
+            skip_memo()
+        return json.dumps(events)
+
+    async def _lookup(self, destination: str, date_range: Optional[Dict[str, str]], key: str) -> list:
+        return await _events_flight.do(key, lambda: self._fetch(destination, date_range, key),
+                                       check=lambda: _events_cache.peek(key))
+
+    async def _fetch(self, destination: str, date_range: Optional[Dict[str, str]], key: str) -> list:
         try:
-            geo = geocode_city(destination)
+            geo = await ageocode_city(destination)
             url = "https://www.eventbriteapi.com/v3/events/search/"
             params = {
                 'location.latitude': geo['lat'],
@@ -178,7 +404,7 @@ class LocalEventsTool(BaseTool):
                 params['start_date.range_start'] = date_range.get('start')
                 params['start_date.range_end'] = date_range.get('end')
             
-            response = requests.get(url, params=params)
+            response = await http_client.aget(url, params=params)
             data = response.json()
             
             events = []
@@ -196,41 +422,41 @@ class LocalEventsTool(BaseTool):
                     "description": f"No major events found for {destination} in this period.",
                     "location": destination
                 })
+            ttl = EVENTS_TTL
         except Exception as e:
             events = [
                 {
                     "name": "Local Festival",
                     "date": date_range.get("start", datetime.now().strftime("%Y-%m-%d")) if date_range else datetime.now().strftime("%Y-%m-%d"),
-                    "description": "Annual cultural festival",
+                    "description": EVENTS_FALLBACK_DESCRIPTION,
                     "location": destination
                 }
             ]
+            ttl = FALLBACK_TTL
         
-        return json.dumps(events)
+        _events_cache.set(key, events, ttl=ttl)
+        return events
 
 class TravelBudgetTool(BaseTool):
     name: str = "Travel Budget Calculator"
     description: str = "Calculate estimated travel budget based on destination, duration, and preferences using real currency conversion."
     args_schema: Type[BaseModel] = TravelBudgetInput
 
+    @memoized_tool_call
     def _run(self, destination: str, duration: int, preferences: List[str]) -> str:
+        return run_sync(self._arun(destination, duration, preferences))
+
+    @memoized_tool_call
+    async def _arun(self, destination: str, duration: int, preferences: List[str]) -> str:
         try:
-            geo = geocode_city(destination)
-            country = geo.get('country', 'US')
-            # Use restcountries API to get currency code
-            currency_code = 'USD'
-            try:
-                rest_url = f'https://restcountries.com/v3.1/alpha/{country}'
-                rest_resp = requests.get(rest_url)
-                rest_data = rest_resp.json()
-                currency_code = list(rest_data[0]['currencies'].keys())[0]
-            except Exception:
-                pass
-            # Get currency rates
-            currency_api_key = os.getenv('CURRENCY_API_KEY')
-            rates_url = f'https://v6.exchangerate-api.com/v6/{currency_api_key}/latest/USD'
-            rates_resp = requests.get(rates_url)
-            rates = rates_resp.json().get('conversion_rates', {})
+            geo = await ageocode_city(destination)
+            currency_code = currency_for_country(geo.get('country', 'US'))
+            # Rates come from a locally shared daily snapshot, not a per-call request
+            snapshot = get_rates_snapshot()
+            # Loading the first snapshot reads SQLite and may fetch; keep it off the event loop
+            rates = snapshot.rates() if snapshot.loaded else await asyncio.to_thread(snapshot.rates)
+            if not rates:
+                raise ValueError("No exchange-rate snapshot available")
             rate = rates.get(currency_code, 1.0)
             # Base costs in USD
             base_costs = {
@@ -247,6 +473,7 @@ class TravelBudgetTool(BaseTool):
                 "total": total
             }
         except Exception as e:
+            skip_memo()
             result = {
                 "accommodation": 100 * duration,
                 "food": 50 * duration,
@@ -262,9 +489,33 @@ class SafetyInfoTool(BaseTool):
     description: str = "Get safety information for a destination including general safety, health concerns, crime rate, and natural disaster risk."
     args_schema: Type[BaseModel] = SafetyInfoInput
 
+    @memoized_tool_call
     def _run(self, destination: str) -> str:
+        key = normalize_key(destination)
+        result = _safety_cache.get(key)
+        if result is MISSING:
+            result = run_sync(self._lookup(destination, key))
+        if result == SAFETY_FALLBACK:
+            skip_memo()
+        return json.dumps(result)
+
+    @memoized_tool_call
+    async def _arun(self, destination: str) -> str:
+        key = normalize_key(destination)
+        result = _safety_cache.get(key)
+        if result is MISSING:
+            result = await self._lookup(destination, key)
+        if result == SAFETY_FALLBACK:
+            skip_memo()
+        return json.dumps(result)
+
+    async def _lookup(self, destination: str, key: str) -> dict:
+        return await _safety_flight.do(key, lambda: self._fetch(destination, key),
+                                       check=lambda: _safety_cache.peek(key))
+
+    async def _fetch(self, destination: str, key: str) -> dict:
         try:
-            geo = geocode_city(destination)
+            geo = await ageocode_city(destination)
             url = f"https://api.opentripmap.com/0.1/en/places/radius"
             params = {
                 'radius': 1000,
@@ -272,7 +523,7 @@ class SafetyInfoTool(BaseTool):
                 'lat': geo['lat'],
                 'apikey': os.getenv('OPENTRIPMAP_API_KEY')
             }
-            response = requests.get(url, params=params)
+            response = await http_client.aget(url, params=params)
             data = response.json()
             # Try to extract tags or info from the first POI
             pois = data.get('features', [])
@@ -290,65 +541,128 @@ class SafetyInfoTool(BaseTool):
                 "crime_rate": "Check local crime statistics",
                 "natural_disasters": "Check local disaster risk"
             }
+            ttl = SAFETY_TTL
         except Exception as e:
-            result = {
-                "general_safety": "Generally safe for tourists",
-                "health_concerns": "No major health concerns",
-                "crime_rate": "Low",
-                "natural_disasters": "Low risk"
-            }
+            result = dict(SAFETY_FALLBACK)
+            ttl = FALLBACK_TTL
         
-        return json.dumps(result)
+        _safety_cache.set(key, result, ttl=ttl)
+        return result
+
+async def _fetch_flights(dep_iata: str, arr_iata: str, date: str) -> list:
+    """Scheduled flights between two airports from Aviation Stack."""
+    url = "http://api.aviationstack.com/v1/flights"
+    params = {
+        'access_key': os.getenv('AVIATION_STACK_API_KEY'),
+        'dep_iata': dep_iata,
+        'arr_iata': arr_iata,
+        'flight_date': date
+    }
+    response = await http_client.aget(url, params=params)
+    return response.json().get('data', [])
+
+async def _fetch_transit_routes(geo: dict) -> list:
+    """Ground transportation routes around a point from TransitLand."""
+    transit_url = f"https://transit.land/api/v2/routes"
+    transit_params = {
+        'api_key': os.getenv('TRANSITLAND_API_KEY'),
+        'lat': geo['lat'],
+        'lon': geo['lon'],
+        'radius': 1000
+    }
+    response = await http_client.aget(transit_url, params=transit_params)
+    return response.json().get('routes', [])
+
+async def _wait(task: Optional[asyncio.Task], deadline: float):
+    """Result of ``task`` and its status: "ok", "timeout", "error" or "skipped"."""
+    if task is None:
+        return None, "skipped"
+    try:
+        remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+        # shield: a timed-out wait must not cancel a task another wait still needs
+        return await asyncio.wait_for(asyncio.shield(task), timeout=remaining), "ok"
+    except asyncio.TimeoutError:
+        return None, "timeout"
+    except Exception:
+        return None, "error"
 
 class TransportationRoutesTool(BaseTool):
     name: str = "Transportation Routes Tool"
     description: str = "Get transportation routes between two locations including flights and transit routes."
     args_schema: Type[BaseModel] = TransportationRoutesInput
+    deadline_seconds: float = ROUTES_DEADLINE_SECONDS
+    output_budget: OutputBudget = OutputBudget(ROUTES_MAX_ITEMS, ROUTES_MAX_BYTES)
 
+    @memoized_tool_call
     def _run(self, origin: str, destination: str, date: Optional[str] = None) -> str:
+        return run_sync(self._arun(origin, destination, date))
+
+    @memoized_tool_call
+    async def _arun(self, origin: str, destination: str, date: Optional[str] = None) -> str:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
+        deadline = asyncio.get_running_loop().time() + self.deadline_seconds
+        airports = get_airport_index()
+
+        # Known city names resolve to airports offline, so flights need not wait for geocoding
+        dep_iata = airports.resolve(origin)
+        arr_iata = airports.resolve(destination)
+        origin_geo_task = flights_task = transit_task = None
+        dest_geo_task = asyncio.ensure_future(ageocode_city(destination))
         try:
-            # Geocode origin and destination
-            origin_geo = geocode_city(origin)
-            dest_geo = geocode_city(destination)
-            # Use Aviation Stack API for flight information
-            url = "http://api.aviationstack.com/v1/flights"
-            params = {
-                'access_key': os.getenv('AVIATION_STACK_API_KEY'),
-                'dep_iata': origin[:3].upper(),  # Placeholder: ideally use a real IATA lookup
-                'arr_iata': destination[:3].upper(),
-                'flight_date': date
-            }
-            response = requests.get(url, params=params)
-            flight_data = response.json()
-            # Use TransitLand API for ground transportation
-            transit_url = f"https://transit.land/api/v2/routes"
-            transit_params = {
-                'api_key': os.getenv('TRANSITLAND_API_KEY'),
-                'lat': dest_geo['lat'],
-                'lon': dest_geo['lon'],
-                'radius': 1000
-            }
-            transit_response = requests.get(transit_url, params=transit_params)
-            transit_data = transit_response.json()
-            result = {
-                "flights": flight_data.get('data', []),
-                "transit_routes": transit_data.get('routes', [])
-            }
-        except Exception as e:
-            result = {
-                "flights": [],
-                "transit_routes": []
-            }
-        
-        return json.dumps(result)
+            if dep_iata and arr_iata and dep_iata != arr_iata:
+                flights_task = asyncio.ensure_future(_fetch_flights(dep_iata, arr_iata, date))
+            else:
+                # The origin is only geocoded for the nearest-airport fallback, alongside the destination
+                origin_geo_task = asyncio.ensure_future(ageocode_city(origin))
+
+            # Transit only depends on the destination coordinates
+            dest_geo, dest_geo_status = await _wait(dest_geo_task, deadline)
+            transit_task = asyncio.ensure_future(_fetch_transit_routes(dest_geo)) if dest_geo else None
+
+            origin_geo_status = "ok"
+            if origin_geo_task is not None:
+                # Fall back to the airport nearest each geocoded point
+                origin_geo, origin_geo_status = await _wait(origin_geo_task, deadline)
+                if not dep_iata and origin_geo:
+                    dep_iata = airports.resolve(origin, origin_geo['lat'], origin_geo['lon'], origin_geo['country'])
+                if not arr_iata and dest_geo:
+                    arr_iata = airports.resolve(destination, dest_geo['lat'], dest_geo['lon'], dest_geo['country'])
+                if dep_iata and arr_iata and dep_iata != arr_iata:
+                    flights_task = asyncio.ensure_future(_fetch_flights(dep_iata, arr_iata, date))
+
+            flights, flights_status = await _wait(flights_task, deadline)
+            if flights_task is None and "timeout" in (origin_geo_status, dest_geo_status):
+                flights_status = "timeout"
+            transit_routes, transit_status = await _wait(transit_task, deadline)
+            if transit_task is None:
+                # Transit never started because the destination geocode failed or ran out of time
+                transit_status = dest_geo_status
+        finally:
+            # Lookups still running past the deadline (or after we were cancelled) are abandoned
+            for task in (origin_geo_task, dest_geo_task, flights_task, transit_task):
+                if task is not None and not task.done():
+                    task.cancel()
+        sources = {"flights": flights_status, "transit_routes": transit_status}
+        if "error" in sources.values() or "timeout" in sources.values():
+            # Partial answer; a later call in this run should try the missing parts again
+            skip_memo()
+        result = {
+            "airports": {"origin": dep_iata, "destination": arr_iata},
+            "flights": flights or [],
+            "transit_routes": transit_routes or [],
+            "sources": sources,
+            "timed_out": [name for name, status in sources.items() if status == "timeout"]
+        }
+        return fit_output(self.name, result, {"flights": FLIGHT_FIELDS, "transit_routes": TRANSIT_ROUTE_FIELDS},
+                          self.output_budget)
 
 class RestaurantRecommendationsTool(BaseTool):
     name: str = "Restaurant Recommendations Tool"
     description: str = "Get restaurant recommendations for a location including name, cuisine, rating, and price range."
     args_schema: Type[BaseModel] = RestaurantRecommendationsInput
 
+    @memoized_tool_call
     def _run(self, location: str) -> str:
         try:
             # Placeholder implementation - in real scenario, use a restaurant API
@@ -374,11 +688,17 @@ class RestaurantRecommendationsTool(BaseTool):
         
         return json.dumps(result)
 
+    @memoized_tool_call
+    async def _arun(self, location: str) -> str:
+        # No I/O involved
+        return self._run(location)
+
 class AccommodationOptionsTool(BaseTool):
     name: str = "Accommodation Options Tool"
     description: str = "Get accommodation options for a destination including hotels with ratings and prices."
     args_schema: Type[BaseModel] = AccommodationOptionsInput
 
+    @memoized_tool_call
     def _run(self, destination: str) -> str:
         try:
             # Placeholder implementation - in real scenario, use a booking API
@@ -404,22 +724,48 @@ class AccommodationOptionsTool(BaseTool):
         
         return json.dumps(result)
 
+    @memoized_tool_call
+    async def _arun(self, destination: str) -> str:
+        # No I/O involved
+        return self._run(destination)
+
 class MatchScoreTool(BaseTool):
     name: str = "Match Score Calculator"
-    description: str = "Calculate how well a city matches user preferences, budget, and season. Returns a score between 0 and 1."
+    description: str = "Calculate how well a city (or a list of cities) matches user preferences, budget, and season. Returns scores between 0 and 1."
     args_schema: Type[BaseModel] = MatchScoreInput
 
-    def _run(self, city: Dict[str, Any], preferences: List[str], budget: float, season: str) -> str:
-        score = calculate_match_score(city, preferences, budget, season)
-        return json.dumps({"match_score": score})
+    @memoized_tool_call
+    def _run(self, city: Union[Dict[str, Any], List[Dict[str, Any]]], preferences: List[str], budget: float, season: str) -> str:
+        if isinstance(city, dict):
+            score = calculate_match_score(city, preferences, budget, season)
+            return json.dumps({"match_score": score})
+        scores = score_cities(city, [MatchProfile(preferences, budget, season)])[:, 0]
+        return json.dumps({
+            "match_scores": [
+                {"name": c.get("name", ""), "match_score": float(score)}
+                for c, score in zip(city, scores)
+            ]
+        })
+
+    @memoized_tool_call
+    async def _arun(self, city: Union[Dict[str, Any], List[Dict[str, Any]]], preferences: List[str], budget: float, season: str) -> str:
+        # No I/O involved
+        return self._run(city, preferences, budget, season)
 
 class GeocodeTool(BaseTool):
     name: str = "Geocoding Tool"
     description: str = "Get latitude, longitude, and country information for a city using OpenTripMap API."
     args_schema: Type[BaseModel] = GeocodeInput
 
+    @memoized_tool_call
     def _run(self, city_name: str) -> str:
-        result = geocode_city(city_name)
+        return run_sync(self._arun(city_name))
+
+    @memoized_tool_call
+    async def _arun(self, city_name: str) -> str:
+        result = await ageocode_city(city_name)
+        if _is_geocode_fallback(result):
+            skip_memo()
         return json.dumps(result)
 
 # Collection of all tools for easy import